@@ -5,7 +5,8 @@ Implements the individual nodes (functions) that make up the Zaylon agent graph.
 
 import json
 import logging
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
@@ -32,6 +33,23 @@ except Exception as e:
     raise
 
 
+# Tools each specialist agent is bound to
+_AGENT_TOOLS = {
+    "sales": SALES_TOOLS,
+    "support": SUPPORT_TOOLS,
+}
+
+
+@lru_cache(maxsize=None)
+def _agent_llm(agent: str):
+    """
+    Agent model with its tools bound, built once per agent.
+    bind_tools converts every tool's schema to the provider's function format,
+    which is identical on every turn.
+    """
+    return llm_base.bind_tools(_AGENT_TOOLS[agent])
+
+
 def get_tool_calls(response):
     """
     Robust extraction of tool calls from AIMessage.
@@ -88,64 +106,62 @@ def sanitize_message_history(messages: List[AIMessage]) -> List[AIMessage]:
     """
     from langchain_core.messages import ToolMessage
 
-    # Track which tool_call_ids have responses
+    # Single pass over the history: collect tool_call_ids that have responses,
+    # and remember which messages carry tool_calls (the only ones that can change)
     tool_call_ids_with_responses = set()
-
-    # First pass: collect all tool_call_ids that have responses
-    for msg in messages:
+    with_tool_calls = []
+    for i, msg in enumerate(messages):
         if isinstance(msg, ToolMessage):
             tool_call_ids_with_responses.add(msg.tool_call_id)
-
-    # Second pass: clean messages
-    cleaned_messages = []
-    for msg in messages:
-        # Check if this is an AIMessage with tool_calls
-        if hasattr(msg, 'tool_calls') and msg.tool_calls:
-            # Filter out tool_calls that don't have responses
-            valid_tool_calls = []
-            orphaned_tool_calls = []
-
-            for tc in msg.tool_calls:
-                tc_id = tc.get('id') if isinstance(tc, dict) else getattr(tc, 'id', None)
-                if tc_id and tc_id in tool_call_ids_with_responses:
-                    valid_tool_calls.append(tc)
-                else:
-                    orphaned_tool_calls.append(tc_id)
-
-            if orphaned_tool_calls:
-                logger.warning(f"[MESSAGE_SANITIZER] Found {len(orphaned_tool_calls)} orphaned tool_calls: {orphaned_tool_calls}")
-
-            # If all tool_calls are orphaned, create a new message without tool_calls
-            if not valid_tool_calls and msg.tool_calls:
-                # Create a new AIMessage without tool_calls
-                from langchain_core.messages import AIMessage
-                cleaned_msg = AIMessage(
-                    content=msg.content if msg.content else "Continuing with the conversation...",
-                    id=msg.id if hasattr(msg, 'id') else None
-                )
-                cleaned_messages.append(cleaned_msg)
-                logger.info(f"[MESSAGE_SANITIZER] Removed all orphaned tool_calls from AIMessage")
-            elif valid_tool_calls != msg.tool_calls:
-                # Some tool_calls are valid, create new message with only valid ones
-                from langchain_core.messages import AIMessage
-                cleaned_msg = AIMessage(
-                    content=msg.content,
-                    tool_calls=valid_tool_calls,
-                    id=msg.id if hasattr(msg, 'id') else None
-                )
-                cleaned_messages.append(cleaned_msg)
-                logger.info(f"[MESSAGE_SANITIZER] Kept {len(valid_tool_calls)}/{len(msg.tool_calls)} tool_calls")
+        elif getattr(msg, 'tool_calls', None):
+            with_tool_calls.append(i)
+
+    # Clean only the messages with tool_calls; everything else is kept as-is
+    cleaned_messages = list(messages)
+    for i in with_tool_calls:
+        msg = messages[i]
+        # Filter out tool_calls that don't have responses
+        valid_tool_calls = []
+        orphaned_tool_calls = []
+
+        for tc in msg.tool_calls:
+            tc_id = tc.get('id') if isinstance(tc, dict) else getattr(tc, 'id', None)
+            if tc_id and tc_id in tool_call_ids_with_responses:
+                valid_tool_calls.append(tc)
             else:
-                # All tool_calls are valid
-                cleaned_messages.append(msg)
-        else:
-            # Not an AIMessage with tool_calls, keep as-is
-            cleaned_messages.append(msg)
+                orphaned_tool_calls.append(tc_id)
+
+        if orphaned_tool_calls:
+            logger.warning(f"[MESSAGE_SANITIZER] Found {len(orphaned_tool_calls)} orphaned tool_calls: {orphaned_tool_calls}")
+
+        # If all tool_calls are orphaned, create a new message without tool_calls
+        if not valid_tool_calls:
+            cleaned_messages[i] = AIMessage(
+                content=msg.content if msg.content else "Continuing with the conversation...",
+                id=msg.id if hasattr(msg, 'id') else None
+            )
+            logger.info(f"[MESSAGE_SANITIZER] Removed all orphaned tool_calls from AIMessage")
+        elif valid_tool_calls != msg.tool_calls:
+            # Some tool_calls are valid, create new message with only valid ones
+            cleaned_messages[i] = AIMessage(
+                content=msg.content,
+                tool_calls=valid_tool_calls,
+                id=msg.id if hasattr(msg, 'id') else None
+            )
+            logger.info(f"[MESSAGE_SANITIZER] Kept {len(valid_tool_calls)}/{len(msg.tool_calls)} tool_calls")
 
     logger.info(f"[MESSAGE_SANITIZER] Processed {len(messages)} messages, output {len(cleaned_messages)} messages")
     return cleaned_messages
 
 
+def _last_human_message(messages: List[Any]) -> Optional[str]:
+    """Content of the most recent HumanMessage, or None if there is none."""
+    return next(
+        (msg.content for msg in reversed(messages) if isinstance(msg, HumanMessage)),
+        None
+    )
+
+
 # ============================================================================
 # Memory Nodes
 # ============================================================================
@@ -216,11 +232,7 @@ async def save_memory_node(state: ZaylonState) -> Dict[str, Any]:
     messages = state["messages"]
 
     # Get the last user message
-    last_user_message = None
-    for msg in reversed(messages):
-        if isinstance(msg, HumanMessage):
-            last_user_message = msg.content
-            break
+    last_user_message = _last_human_message(messages)
 
     if not last_user_message:
         logger.info("[SAVE_MEMORY] No user message to extract facts from")
@@ -345,11 +357,7 @@ async def supervisor_node(state: ZaylonState) -> Dict[str, Any]:
         profile_summary = "User profile:\n" + "\n".join(profile_items)
 
     # Get last user message
-    last_message = None
-    for msg in reversed(messages):
-        if isinstance(msg, HumanMessage):
-            last_message = msg.content
-            break
+    last_message = _last_human_message(messages)
 
     if not last_message:
         logger.warning("[SUPERVISOR] No user message found, defaulting to Support")
@@ -574,7 +582,7 @@ MUST: Be direct and professional - no unnecessary explanations
 
     try:
         # Create agent with tools - simple binding without forcing
-        sales_agent = llm_base.bind_tools(SALES_TOOLS)
+        sales_agent = _agent_llm("sales")
 
         # Sanitize message history to ensure tool_calls have corresponding responses
         sanitized_messages = sanitize_message_history(messages)
@@ -822,7 +830,7 @@ Remember: TOOL FIRST, RESPONSE SECOND. Always call tools before responding."""
 
     try:
         # Create agent with tools - simple binding without forcing
-        support_agent = llm_base.bind_tools(SUPPORT_TOOLS)
+        support_agent = _agent_llm("support")
 
         # Sanitize message history to ensure tool_calls have corresponding responses
         sanitized_messages = sanitize_message_history(messages)
@@ -11,6 +11,7 @@ from app.db import get_db
 from app.core.security import verify_api_key, limiter, get_rate_limit_string
 from app.schemas import (
     AnalyticsLogRequest, AnalyticsLogResponse,
+    AnalyticsLogBatchRequest, AnalyticsLogBatchResponse,
     AnalyticsDashboardResponse
 )
 from app.services import analytics
@@ -48,6 +49,27 @@ async def log_analytics(
     )
 
 
+@router.post(
+    "/log-batch",
+    response_model=AnalyticsLogBatchResponse,
+    summary="Log a batch of analytics events"
+)
+@limiter.limit(get_rate_limit_string())
+async def log_analytics_batch(
+    request: Request,
+    body: AnalyticsLogBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Log up to 500 analytics events in one request.
+
+    The whole list is validated in a single pass and written with one commit,
+    instead of one request and one transaction per event.
+    """
+    return await analytics.log_events(db=db, events=body.events)
+
+
 @router.get(
     "/dashboard",
     response_model=AnalyticsDashboardResponse,
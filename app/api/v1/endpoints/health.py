@@ -31,7 +31,7 @@ async def health_check(db: AsyncSession = Depends(get_db)):
     qdrant_status = "not_configured"
     try:
         vector_db = get_vector_db()
-        if vector_db.is_connected():
+        if await vector_db.ping():
             qdrant_status = "connected"
         else:
             qdrant_status = "disconnected"
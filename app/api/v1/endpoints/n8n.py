@@ -159,7 +159,8 @@ async def n8n_prepare_context(
         )
     )
 
-    return PrepareContextResponse(
+    # Built from already-validated service results: skip re-validation
+    return PrepareContextResponse.model_construct(
         conversation_history=context_result.formatted_for_ai,
         relevant_products=product_result.formatted_for_ai,
         intent_analysis=intent_result,
@@ -390,7 +391,8 @@ async def n8n_prepare_context_enhanced(
     elapsed_ms = int((time.time() - start_time) * 1000)
     logger.info(f"Enhanced prepare context completed in {elapsed_ms}ms (skip_ai={skip_ai})")
 
-    return PrepareContextEnhancedResponse(
+    # Built from already-validated service results: skip re-validation
+    return PrepareContextEnhancedResponse.model_construct(
         conversation_history=context_result.formatted_for_ai,
         relevant_products=rag_context["products_formatted"],
         intent_analysis=intent_result,
@@ -469,7 +471,7 @@ async def n8n_process_complete(
             message=body.message, direction="incoming", intent=intent_result.intent
         )
 
-        return ProcessCompleteResponse(
+        return ProcessCompleteResponse.model_construct(
             conversation_history=context_result.formatted_for_ai,
             relevant_products=rag_context["products_formatted"],
             customer_order_history=order_history_formatted,
@@ -542,7 +544,7 @@ async def n8n_process_complete(
             )
         )
 
-        return ProcessCompleteResponse(
+        return ProcessCompleteResponse.model_construct(
             conversation_history="",
             relevant_products="",
             customer_order_history="",
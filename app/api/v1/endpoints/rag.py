@@ -142,6 +142,8 @@ async def index_product(
         raise HTTPException(status_code=404, detail=f"Product not found: {body.product_id}")
 
     success = await ingestion_service.index_product(product)
+    if success:
+        get_rag_service().cache_clear()
 
     return IndexProductResponse(
         success=success,
@@ -173,6 +175,7 @@ async def index_all_products(
     """
     ingestion_service = get_ingestion_service()
     stats = await ingestion_service.index_all_products(db)
+    get_rag_service().cache_clear()
 
     return IndexAllProductsResponse(**stats, success=True)
 
@@ -240,7 +243,7 @@ async def rag_status(
     vector_db = get_vector_db()
     embedding_service = get_embedding_service()
 
-    connected = vector_db.is_connected()
+    connected = await vector_db.ping()
 
     products_info = None
     knowledge_info = None
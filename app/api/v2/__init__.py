@@ -0,0 +1 @@
+"""API v2 (agentic system)."""
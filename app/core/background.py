@@ -18,7 +18,6 @@ class BackgroundTaskManager:
         self._queue: deque = deque(maxlen=max_queue_size)
         self._running = False
         self._task = None
-        self._lock = asyncio.Lock()
 
     async def start(self):
         """Start the background task processor."""
@@ -56,13 +55,10 @@ class BackgroundTaskManager:
 
     async def _process_single_task(self):
         """Process a single task from the queue."""
+        # No await between the check and the pop, so this is atomic on the event loop
         if not self._queue:
             return
-
-        async with self._lock:
-            if not self._queue:
-                return
-            coro = self._queue.popleft()
+        coro = self._queue.popleft()
 
         try:
             await coro
@@ -22,6 +22,9 @@ NAME_PATTERNS = [
     r'(?:name:|الاسم:?)\s+([a-zA-Z\u0600-\u06FF]+)',
 ]
 
+# Hybrid search (Reciprocal Rank Fusion)
+RRF_K = 60  # Rank damping constant; standard value from the RRF paper
+
 # Embedding dimensions
 EMBEDDING_DIMENSION_OPENAI = 1536
 EMBEDDING_DIMENSION_LOCAL = 384
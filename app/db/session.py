@@ -1,9 +1,10 @@
 """
 Database session management using SQLAlchemy async.
 """
+import re
 import socket
 from typing import AsyncGenerator
-from urllib.parse import urlparse, urlunparse
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
@@ -12,6 +13,22 @@ from app.core.config import get_settings
 settings = get_settings()
 
 
+# scheme://[user[:password]@]host[:port]... -- userinfo is matched greedily so the
+# host starts after the last '@' of the authority, as urllib.parse does
+_HOST_RE = re.compile(
+    r'://(?:[^/?#]*@)?(?P<host>\[[^\]]+\]|[^:/?#]+)(?::(?P<port>\d+))?'
+)
+
+
+def is_unix_socket_url(database_url: str) -> bool:
+    """
+    Check whether the URL connects over a UNIX domain socket.
+    e.g. postgresql+asyncpg:///db?host=/var/run/postgresql
+    """
+    match = _HOST_RE.search(database_url)
+    return match is None or 'host=/' in database_url
+
+
 def force_ipv4_connection_url(database_url: str) -> str:
     """
     Force IPv4 resolution for database connection URL.
@@ -21,9 +38,8 @@ def force_ipv4_connection_url(database_url: str) -> str:
     logger = logging.getLogger(__name__)
 
     try:
-        # Parse the database URL
-        parsed = urlparse(database_url)
-        hostname = parsed.hostname
+        match = _HOST_RE.search(database_url)
+        hostname = match.group('host') if match else None
 
         if not hostname:
             return database_url
@@ -40,17 +56,19 @@ def force_ipv4_connection_url(database_url: str) -> str:
             pass
 
         # Check if it's an IPv6 address (skip resolution)
-        if ':' in hostname and '[' in parsed.netloc:
+        if hostname.startswith('['):
             # It's an IPv6 address, try to resolve to IPv4
             logger.warning(f"Detected IPv6 address in connection string: {hostname}")
             hostname = hostname.strip('[]')
 
+        port = match.group('port')
+
         # Resolve hostname to IPv4 only
         try:
             # Get IPv4 addresses only (AF_INET)
             addr_info = socket.getaddrinfo(
                 hostname,
-                parsed.port,
+                int(port) if port else None,
                 socket.AF_INET,  # Force IPv4
                 socket.SOCK_STREAM
             )
@@ -58,21 +76,12 @@ def force_ipv4_connection_url(database_url: str) -> str:
                 ipv4_address = addr_info[0][4][0]
                 logger.info(f"Resolved {hostname} to IPv4: {ipv4_address}")
 
-                # Rebuild the netloc with IPv4 address
-                if parsed.username and parsed.password:
-                    new_netloc = f"{parsed.username}:{parsed.password}@{ipv4_address}"
-                elif parsed.username:
-                    new_netloc = f"{parsed.username}@{ipv4_address}"
-                else:
-                    new_netloc = ipv4_address
-
-                # Add port if present
-                if parsed.port:
-                    new_netloc = f"{new_netloc}:{parsed.port}"
-
-                # Reconstruct URL
-                new_parsed = parsed._replace(netloc=new_netloc)
-                resolved_url = urlunparse(new_parsed)
+                # Swap the host in place; credentials, port, path and query are kept as-is
+                resolved_url = (
+                    database_url[:match.start('host')]
+                    + ipv4_address
+                    + database_url[match.end('host'):]
+                )
                 logger.info(f"Database URL successfully converted to IPv4")
                 return resolved_url
         except socket.gaierror as e:
@@ -87,8 +96,13 @@ def force_ipv4_connection_url(database_url: str) -> str:
     return database_url
 
 
-# Force IPv4 connection
-ipv4_database_url = force_ipv4_connection_url(settings.database_url)
+# Force IPv4 connection only where the platform needs it (FORCE_IPV4=true).
+# UNIX socket DSNs (co-located DB) have no host to resolve and skip it entirely.
+ipv4_database_url = (
+    force_ipv4_connection_url(settings.database_url)
+    if settings.force_ipv4 and not is_unix_socket_url(settings.database_url)
+    else settings.database_url
+)
 
 # Create async engine with IPv4-compatible settings
 engine = create_async_engine(
@@ -97,7 +111,8 @@ engine = create_async_engine(
     pool_size=20,
     max_overflow=10,
     pool_pre_ping=True,
-    pool_recycle=3600,
+    pool_recycle=1800,
+    pool_use_lifo=True,  # Reuse the most recently returned (warm) connection first
     connect_args={
         "timeout": 30,  # Increase connection timeout
         "command_timeout": 60,  # Command execution timeout
@@ -109,6 +124,19 @@ engine = create_async_engine(
     }
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _enable_tcp_keepalive(dbapi_connection, connection_record):
+    """Enable TCP keepalive on new connections so idle pooled sockets stay open."""
+    try:
+        transport = dbapi_connection.driver_connection._transport
+        sock = transport.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except (AttributeError, OSError):
+        pass
+
+
 # Create async session factory
 async_session = async_sessionmaker(
     engine,
@@ -125,12 +153,9 @@ Base = declarative_base()
 # ============================================================================
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session."""
+    """Get database session (closed by the context manager on exit)."""
     async with async_session() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
 
 
 async def init_db():
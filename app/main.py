@@ -4,12 +4,12 @@ Main entry point with modular route organization.
 """
 import logging
 import warnings
-from datetime import datetime
 from contextlib import asynccontextmanager
+from pathlib import Path
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import ORJSONResponse, FileResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from fastapi.staticfiles import StaticFiles
@@ -17,20 +17,14 @@ from fastapi.staticfiles import StaticFiles
 from app.core.config import get_settings
 from app.db import init_db, close_db
 from app.core.security import limiter
-from app.schemas import ErrorResponse
+from app.schemas.common import utc_now_cached
 from app.core.background import background_tasks
 from app.services import (
     get_embedding_service, get_vector_db, init_vector_db, close_vector_db
 )
 from app.api.v1.router import api_router
-
-# Import agent v2 router from root-level routes
-# (Agent v2 is mounted separately with /api/v2 prefix, not under /api/v1)
-import sys
-from pathlib import Path
-# Add root directory to path to import from routes module
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from routes.agent import router as agent_v2_router
+# Agent v2 is mounted separately with /api/v2 prefix, not under /api/v1
+from app.api.v2.agent import router as agent_v2_router
 
 # Configure logging
 logging.basicConfig(
@@ -61,7 +55,7 @@ async def lifespan(app: FastAPI):
         logger.info(f"Embedding service initialized (dimension: {embedding_dim})")
 
         vector_db = get_vector_db()
-        if vector_db.is_connected():
+        if await vector_db.ping():
             await init_vector_db(embedding_dim)
             logger.info("Vector database (Qdrant) initialized")
         else:
@@ -85,6 +79,7 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="AI-powered microservice for e-commerce Instagram/WhatsApp DM automation",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -103,16 +98,21 @@ app.add_middleware(
 
 
 # Error Handlers
+# Handlers build the ErrorResponse shape as plain dicts: the payload is fully
+# trusted, so model construction and validation are skipped on the error path.
+_INTERNAL_ERROR_CONTENT = {
+    "error": "Internal Server Error",
+    "detail": "An unexpected error occurred",
+}
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions."""
-    return JSONResponse(
+    detail = str(exc.detail)
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content=ErrorResponse(
-            error=exc.detail,
-            detail=str(exc.detail),
-            timestamp=datetime.utcnow().isoformat()
-        ).model_dump()
+        content={"error": detail, "detail": detail, "timestamp": utc_now_cached()}
     )
 
 
@@ -120,14 +120,11 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unhandled exceptions."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
-        status_code=500,
-        content=ErrorResponse(
-            error="Internal Server Error",
-            detail=str(exc) if settings.debug else "An unexpected error occurred",
-            timestamp=datetime.utcnow().isoformat()
-        ).model_dump()
-    )
+    if settings.debug:
+        content = {"error": "Internal Server Error", "detail": str(exc), "timestamp": utc_now_cached()}
+    else:
+        content = {**_INTERNAL_ERROR_CONTENT, "timestamp": utc_now_cached()}
+    return ORJSONResponse(status_code=500, content=content)
 
 
 # Include API v1 router
@@ -19,7 +19,7 @@ class AnalyticsEvent(Base):
     event_data = Column(JSONB, nullable=False)
     response_time_ms = Column(Integer)
     ai_tokens_used = Column(Integer)
-    created_at = Column(DateTime, default=func.now(), index=True)
+    created_at = Column(DateTime, server_default=func.now(), index=True)
 
     __table_args__ = (
         Index('idx_analytics_type_created', 'event_type', 'created_at'),
@@ -2,7 +2,7 @@
 Response cache database model.
 """
 import uuid
-from sqlalchemy import Column, String, Text, Integer, DateTime
+from sqlalchemy import Column, String, Text, Integer, DateTime, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -14,7 +14,7 @@ class ResponseCache(Base):
     __tablename__ = "response_cache"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    message_hash = Column(String(64), unique=True, nullable=False, index=True)
+    message_hash = Column(LargeBinary(16), unique=True, nullable=False, index=True)  # raw xxh3_128 digest
     normalized_message = Column(Text, nullable=False)
     cached_response = Column(Text, nullable=False)
     intent = Column(String(100))
@@ -41,6 +41,8 @@ from .cache import (
 from .analytics import (
     AnalyticsLogRequest,
     AnalyticsLogResponse,
+    AnalyticsLogBatchRequest,
+    AnalyticsLogBatchResponse,
     TopIntent,
     TopProduct,
     AnalyticsDashboardResponse,
@@ -83,6 +85,15 @@ from .n8n import (
     ProcessCompleteResponse,
 )
 
+# Agent v2 schemas
+from .agent import (
+    AgentInvokeRequest,
+    AgentThought,
+    AgentToolCall,
+    AgentInvokeResponse,
+    AgentStreamChunk,
+)
+
 # Common schemas
 from .common import (
     ErrorResponse,
@@ -115,6 +126,8 @@ __all__ = [
     # Analytics
     "AnalyticsLogRequest",
     "AnalyticsLogResponse",
+    "AnalyticsLogBatchRequest",
+    "AnalyticsLogBatchResponse",
     "TopIntent",
     "TopProduct",
     "AnalyticsDashboardResponse",
@@ -146,6 +159,12 @@ __all__ = [
     "StoreInteractionResponse",
     "ProcessCompleteRequest",
     "ProcessCompleteResponse",
+    # Agent v2
+    "AgentInvokeRequest",
+    "AgentThought",
+    "AgentToolCall",
+    "AgentInvokeResponse",
+    "AgentStreamChunk",
     # Common
     "ErrorResponse",
     "HealthCheckResponse",
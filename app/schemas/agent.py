@@ -0,0 +1,64 @@
+"""Agentic system schemas (Zaylon v2 API)."""
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field
+from .common import ChannelLiteral
+
+
+class AgentInvokeRequest(BaseModel):
+    """Request model for agent invocation."""
+    customer_id: str = Field(..., min_length=1, description="Customer identifier (e.g., 'instagram:@username')")
+    message: str = Field(..., min_length=1, max_length=5000, description="User's message")
+    channel: ChannelLiteral = Field(..., description="Communication channel")
+    thread_id: Optional[str] = Field(default=None, description="Optional thread ID for conversation persistence")
+
+
+class AgentThought(BaseModel):
+    """Individual reasoning step in the agent's chain of thought."""
+    node: str = Field(..., description="Node name (e.g., 'supervisor', 'sales_agent')")
+    reasoning: str = Field(..., description="Agent's reasoning at this step")
+    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+
+
+class AgentToolCall(BaseModel):
+    """Record of a tool invocation by an agent."""
+    tool_name: str
+    arguments: Dict[str, Any]
+    result: Optional[str] = None
+    success: bool = True
+
+
+class AgentInvokeResponse(BaseModel):
+    """Response model for agent invocation."""
+    success: bool
+    response: str = Field(..., description="Final response from the agent")
+    agent_used: str = Field(..., description="Which agent handled the request (sales/support)")
+    chain_of_thought: List[AgentThought] = Field(default_factory=list, description="Full reasoning chain")
+    tool_calls: List[AgentToolCall] = Field(default_factory=list, description="Tools invoked during execution")
+    user_profile: Dict[str, Any] = Field(default_factory=dict, description="Customer facts from Memory Bank")
+    execution_time_ms: int = Field(..., ge=0, description="Total execution time")
+    thread_id: str = Field(..., description="Thread ID for conversation continuity")
+    error: Optional[str] = None
+
+
+class AgentStreamChunk(BaseModel):
+    """Streaming response chunk for agent invocation."""
+    type: str = Field(..., description="Chunk type: 'log', 'thinking', 'tool_call', 'tool_result', 'agent_processing', 'response', 'final_response'")
+    content: Optional[str] = None
+    node: Optional[str] = None
+    tool_name: Optional[str] = None
+    tool_args: Optional[Dict[str, Any]] = None
+    tool_result: Optional[str] = None
+    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    execution_time_ms: Optional[int] = None
+    done: bool = False
+
+    # Final response fields (only present when type='final_response')
+    success: Optional[bool] = None
+    response: Optional[str] = None
+    agent_used: Optional[str] = None
+    chain_of_thought: Optional[List[AgentThought]] = None
+    tool_calls: Optional[List[AgentToolCall]] = None
+    user_profile: Optional[Dict[str, Any]] = None
+    thread_id: Optional[str] = None
+    error: Optional[str] = None
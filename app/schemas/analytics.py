@@ -15,6 +15,15 @@ class AnalyticsLogResponse(BaseModel):
     success: bool
 
 
+class AnalyticsLogBatchRequest(BaseModel):
+    events: List[AnalyticsLogRequest] = Field(..., min_length=1, max_length=500)
+
+
+class AnalyticsLogBatchResponse(BaseModel):
+    success: bool
+    logged: int
+
+
 class TopIntent(BaseModel):
     intent: str
     count: int
@@ -1,13 +1,34 @@
 """Common response schemas."""
-from datetime import datetime
-from typing import Optional
+import time
+from datetime import datetime, timezone
+from typing import Annotated, Literal, Optional
 from pydantic import BaseModel, Field
 
+# Shared field types: Literal is validated by a set membership check in
+# pydantic-core rather than a regex match per request
+ChannelLiteral = Literal["instagram", "whatsapp"]
+DirectionLiteral = Literal["incoming", "outgoing"]
+MessageText = Annotated[str, Field(min_length=1, max_length=5000)]
+
+# (epoch second, formatted timestamp) of the last call to utc_now_cached()
+_last_timestamp: tuple = (0, "")
+
+
+def utc_now_cached() -> str:
+    """Current UTC time as ISO-8601, formatted at most once per second."""
+    global _last_timestamp
+    now_sec = int(time.time())
+    if now_sec == _last_timestamp[0]:
+        return _last_timestamp[1]
+    formatted = datetime.fromtimestamp(now_sec, tz=timezone.utc).isoformat()
+    _last_timestamp = (now_sec, formatted)
+    return formatted
+
 
 class ErrorResponse(BaseModel):
     error: str
     detail: str
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=utc_now_cached)
 
 
 class HealthCheckResponse(BaseModel):
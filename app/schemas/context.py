@@ -1,13 +1,14 @@
 """Conversation context schemas."""
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
+from .common import ChannelLiteral, DirectionLiteral, MessageText
 
 
 class StoreContextRequest(BaseModel):
     customer_id: str = Field(..., min_length=1, description="Customer identifier (e.g., 'instagram:@username')")
-    channel: str = Field(..., pattern="^(instagram|whatsapp)$")
-    message: str = Field(..., min_length=1, max_length=5000)
-    direction: str = Field(..., pattern="^(incoming|outgoing)$")
+    channel: ChannelLiteral
+    message: MessageText
+    direction: DirectionLiteral
     intent: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
@@ -1,6 +1,7 @@
 """n8n integration schemas."""
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
+from .common import ChannelLiteral, MessageText
 from .context import CustomerMetadata
 from .orders import EnhancedCustomerMetadata
 from .intent import IntentClassifyResponse
@@ -9,8 +10,8 @@ from .rag import RAGSearchResponse
 
 class PrepareContextRequest(BaseModel):
     customer_id: str
-    message: str = Field(..., min_length=1, max_length=5000)
-    channel: str = Field(..., pattern="^(instagram|whatsapp)$")
+    message: MessageText
+    channel: ChannelLiteral
 
 
 class PrepareContextResponse(BaseModel):
@@ -36,8 +37,8 @@ class PrepareContextResponseRAG(BaseModel):
 
 class PrepareContextEnhancedRequest(BaseModel):
     customer_id: str
-    message: str = Field(..., min_length=1, max_length=5000)
-    channel: str = Field(..., pattern="^(instagram|whatsapp)$")
+    message: MessageText
+    channel: ChannelLiteral
 
 
 class PrepareContextEnhancedResponse(BaseModel):
@@ -53,7 +54,7 @@ class PrepareContextEnhancedResponse(BaseModel):
 
 class StoreInteractionRequest(BaseModel):
     customer_id: str
-    channel: str = Field(..., pattern="^(instagram|whatsapp)$")
+    channel: ChannelLiteral
     user_message: str
     ai_response: str
     intent: str
@@ -71,7 +72,7 @@ class ProcessCompleteRequest(BaseModel):
     """Combined request for streamlined endpoint."""
     customer_id: str
     message: str
-    channel: str = Field(..., pattern="^(instagram|whatsapp)$")
+    channel: ChannelLiteral
     ai_response: Optional[str] = None
     action: Optional[str] = None
     order_data: Optional[Dict[str, Any]] = None
@@ -1,12 +1,13 @@
 """Order management schemas."""
 from typing import Optional, List
 from pydantic import BaseModel, Field
+from .common import ChannelLiteral
 from .context import CustomerMetadata
 
 
 class CreateOrderRequest(BaseModel):
     customer_id: str = Field(..., description="Customer identifier")
-    channel: str = Field(..., pattern="^(instagram|whatsapp)$")
+    channel: ChannelLiteral
     product_id: str = Field(..., description="Product UUID")
     product_name: str
     size: str
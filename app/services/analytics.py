@@ -11,7 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import AnalyticsEvent, Conversation
 from app.db import async_session
 from app.schemas import (
-    AnalyticsLogResponse, AnalyticsDashboardResponse,
+    AnalyticsLogRequest, AnalyticsLogResponse, AnalyticsLogBatchResponse,
+    AnalyticsDashboardResponse,
     TopIntent, TopProduct
 )
 from app.core.constants import (
@@ -61,6 +62,31 @@ async def log_event(
     return AnalyticsLogResponse(success=True)
 
 
+async def log_events(
+    db: AsyncSession,
+    events: List[AnalyticsLogRequest]
+) -> AnalyticsLogBatchResponse:
+    """
+    Log a batch of analytics events with a single commit.
+    The batch is validated once by the request schema, so rows are built directly.
+    """
+    logger.info(f"Logging batch of {len(events)} events")
+
+    db.add_all([
+        AnalyticsEvent(
+            customer_id=event.customer_id,
+            event_type=event.event_type,
+            event_data=event.event_data,
+            response_time_ms=event.response_time_ms,
+            ai_tokens_used=event.ai_tokens_used
+        )
+        for event in events
+    ])
+    await db.commit()
+
+    return AnalyticsLogBatchResponse(success=True, logged=len(events))
+
+
 async def log_event_background(
     customer_id: str,
     event_type: Union[str, EventType],
@@ -4,20 +4,53 @@ Caches common responses to reduce AI API calls.
 """
 import hashlib
 import re
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Optional
-from sqlalchemy import select, delete, update
+from sqlalchemy import select, delete, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.background import background_tasks
+from app.db import async_session
 from app.models import ResponseCache
 from app.schemas import CacheCheckResponse, CacheStoreResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
-
+try:
+    import xxhash
+except ImportError:  # optional dependency
+    xxhash = None
+    logger.warning("xxhash not available, cache keys use BLAKE2b-128")
+
+# Patterns used by normalize_message (compiled once at import)
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001F000-\U0001FFFF"  # emoji, pictographs, flags, skin tones (SMP emoji blocks)
+    "\u2300-\u23FF"          # misc technical (watch, hourglass, ...)
+    "\u2600-\u27BF"          # misc symbols & dingbats
+    "\u2B00-\u2BFF"          # arrows & stars
+    "\u200D\uFE0F\u20E3"     # ZWJ, emoji presentation selector, keycap: strip whole sequences
+    "\U000E0020-\U000E007F"  # tag characters (subdivision flags)
+    "]+"
+)
+_PUNCT_RE = re.compile(r'[^\w\s\u0600-\u06FF]')
+# Same result on pure-ASCII text without Unicode class lookups
+_ASCII_PUNCT_RE = re.compile(r'[^\w\s]', re.ASCII)
+
+# Current UTC time evaluated by Postgres (expires_at is a naive UTC timestamp), so
+# expiry filters carry no Python datetime parameter and use the database clock
+_UTC_NOW = func.timezone('utc', func.now())
+
+# Phrases that mark a response as personalized (never cached); one scan per response
+_PERSONALIZED_RE = re.compile(r"your order|order\s*#|confirmation", re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
 def normalize_message(message: str) -> str:
     """
-    Normalize message for cache key generation.
+    Normalize message for cache key generation (memoized: check and store
+    normalize the same message).
 
     - Lowercase
     - Remove extra whitespace
@@ -27,32 +60,29 @@ def normalize_message(message: str) -> str:
     # Lowercase
     normalized = message.lower()
 
-    # Remove emojis
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F1E0-\U0001F1FF"  # flags
-        "\U00002702-\U000027B0"
-        "\U000024C2-\U0001F251"
-        "]+",
-        flags=re.UNICODE
-    )
-    normalized = emoji_pattern.sub('', normalized)
-
-    # Remove punctuation except Arabic characters
-    normalized = re.sub(r'[^\w\s\u0600-\u06FF]', ' ', normalized)
-
-    # Normalize whitespace
-    normalized = ' '.join(normalized.split())
+    # Remove emojis (pure-ASCII text has none, so skip the scan) and
+    # punctuation except Arabic characters
+    if normalized.isascii():
+        normalized = _ASCII_PUNCT_RE.sub(' ', normalized)
+    else:
+        normalized = _EMOJI_RE.sub('', normalized)
+        normalized = _PUNCT_RE.sub(' ', normalized)
 
-    return normalized.strip()
+    # Normalize whitespace (split() also drops leading/trailing whitespace)
+    return ' '.join(normalized.split())
 
 
-def hash_message(normalized_message: str) -> str:
-    """Generate MD5 hash of normalized message."""
-    return hashlib.md5(normalized_message.encode('utf-8')).hexdigest()
+@lru_cache(maxsize=4096)
+def hash_message(normalized_message: str) -> bytes:
+    """
+    Generate the 16-byte digest of normalized message: xxh3_128, or BLAKE2b
+    with a 128-bit digest when xxhash is not installed (same column width,
+    different keys, so entries written by one are misses for the other).
+    """
+    data = normalized_message.encode('utf-8')
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
 
 
 async def check_cache(
@@ -69,21 +99,20 @@ async def check_cache(
     normalized = normalize_message(message)
     message_hash = hash_message(normalized)
 
-    logger.debug(f"Checking cache for hash: {message_hash}")
+    logger.debug(f"Checking cache for hash: {message_hash.hex()}")
 
-    # Query cache
-    stmt = select(ResponseCache).where(
+    # Query cache (only the columns the hit path reads)
+    stmt = select(ResponseCache.id, ResponseCache.cached_response).where(
         ResponseCache.message_hash == message_hash,
-        ResponseCache.expires_at > datetime.utcnow()
+        ResponseCache.expires_at > _UTC_NOW
     )
 
     result = await db.execute(stmt)
-    cached = result.scalar_one_or_none()
+    cached = result.first()
 
     if cached:
-        # Update hit count
-        cached.hit_count += 1
-        await db.commit()
+        # Update hit count off the request path
+        background_tasks.add_task(_bump_hit_count(cached.id))
 
         # Estimate saved tokens (rough estimate: 1 token per 4 chars)
         saved_tokens = len(cached.cached_response) // 4
@@ -106,6 +135,20 @@ async def check_cache(
     )
 
 
+async def _bump_hit_count(cache_id) -> None:
+    """Atomically increment a cache entry's hit count in its own session."""
+    async with async_session() as db:
+        try:
+            await db.execute(
+                update(ResponseCache)
+                .where(ResponseCache.id == cache_id)
+                .values(hit_count=ResponseCache.hit_count + 1)
+            )
+            await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to bump cache hit count: {e}", exc_info=True)
+
+
 async def store_cache(
     db: AsyncSession,
     message: str,
@@ -126,7 +169,7 @@ async def store_cache(
         return CacheStoreResponse(success=False)
 
     # Don't cache personalized responses
-    if any(word in response.lower() for word in ["your order", "order #", "confirmation"]):
+    if _PERSONALIZED_RE.search(response):
         return CacheStoreResponse(success=False)
 
     normalized = normalize_message(message)
@@ -135,42 +178,54 @@ async def store_cache(
 
     logger.info(f"Storing in cache with TTL {ttl_hours}h")
 
-    # Upsert pattern
-    stmt = select(ResponseCache).where(ResponseCache.message_hash == message_hash)
-    result = await db.execute(stmt)
-    existing = result.scalar_one_or_none()
-
-    if existing:
-        # Update existing cache entry
-        existing.cached_response = response
-        existing.intent = intent
-        existing.expires_at = expires_at
-        existing.hit_count += 1
-    else:
-        # Create new cache entry
-        cache_entry = ResponseCache(
-            message_hash=message_hash,
-            normalized_message=normalized,
-            cached_response=response,
-            intent=intent,
-            expires_at=expires_at
-        )
-        db.add(cache_entry)
-
+    # Single-statement upsert: one round trip, and no race between a SELECT and the INSERT
+    stmt = pg_insert(ResponseCache).values(
+        message_hash=message_hash,
+        normalized_message=normalized,
+        cached_response=response,
+        intent=intent,
+        expires_at=expires_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ResponseCache.message_hash],
+        set_={
+            "cached_response": stmt.excluded.cached_response,
+            "intent": stmt.excluded.intent,
+            "expires_at": stmt.excluded.expires_at,
+            "hit_count": ResponseCache.hit_count + 1,
+        }
+    )
+    await db.execute(stmt)
     await db.commit()
 
     return CacheStoreResponse(success=True)
 
 
-async def cleanup_expired_cache(db: AsyncSession) -> int:
-    """Remove expired cache entries. Returns number of entries removed."""
-    stmt = delete(ResponseCache).where(
-        ResponseCache.expires_at < datetime.utcnow()
+async def cleanup_expired_cache(db: AsyncSession, batch_size: int = 1000) -> int:
+    """
+    Remove expired cache entries. Returns number of entries removed.
+    Deletes in batches of batch_size rows, committing each, so row locks and
+    WAL per transaction stay bounded and cache reads/writes aren't blocked.
+    """
+    expired_ids = (
+        select(ResponseCache.id)
+        .where(ResponseCache.expires_at < _UTC_NOW)
+        .limit(batch_size)
     )
-    result = await db.execute(stmt)
-    await db.commit()
+    stmt = (
+        delete(ResponseCache)
+        .where(ResponseCache.id.in_(expired_ids.scalar_subquery()))
+        .execution_options(synchronize_session=False)
+    )
+
+    deleted_count = 0
+    while True:
+        result = await db.execute(stmt)
+        await db.commit()
+        deleted_count += result.rowcount
+        if result.rowcount < batch_size:
+            break
 
-    deleted_count = result.rowcount
     if deleted_count > 0:
         logger.info(f"Cleaned up {deleted_count} expired cache entries")
 
@@ -179,24 +234,14 @@ async def cleanup_expired_cache(db: AsyncSession) -> int:
 
 async def get_cache_stats(db: AsyncSession) -> dict:
     """Get cache statistics."""
-    from sqlalchemy import func
-
-    # Total entries
-    stmt = select(func.count()).select_from(ResponseCache)
-    result = await db.execute(stmt)
-    total_entries = result.scalar() or 0
-
-    # Total hits
-    stmt = select(func.sum(ResponseCache.hit_count)).select_from(ResponseCache)
-    result = await db.execute(stmt)
-    total_hits = result.scalar() or 0
-
-    # Expired entries
-    stmt = select(func.count()).select_from(ResponseCache).where(
-        ResponseCache.expires_at < datetime.utcnow()
-    )
+    # Entries, hits and expired entries in one aggregate query
+    stmt = select(
+        func.count(),
+        func.coalesce(func.sum(ResponseCache.hit_count), 0),
+        func.count().filter(ResponseCache.expires_at < _UTC_NOW)
+    ).select_from(ResponseCache)
     result = await db.execute(stmt)
-    expired_entries = result.scalar() or 0
+    total_entries, total_hits, expired_entries = result.one()
 
     return {
         "total_entries": total_entries,
@@ -6,8 +6,9 @@ OPTIMIZED: Added in-memory caching for frequent lookups.
 import re
 import logging
 import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Any
 
 from sqlalchemy import select, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,8 +28,13 @@ from app.core.constants import (
 
 logger = logging.getLogger(__name__)
 
+# Patterns used by the profile extractors (compiled once at import)
+_PHONE_RE = re.compile(PHONE_PATTERN)
+_NAME_RES = [re.compile(pattern, re.IGNORECASE) for pattern in NAME_PATTERNS]
+
 # Simple in-memory cache for context
-_context_cache: Dict[str, tuple] = {}  # {customer_id: (result, timestamp)}
+# Kept in write order, so the front always holds the oldest timestamps
+_context_cache: "OrderedDict[str, tuple]" = OrderedDict()  # {customer_id: (result, timestamp)}
 
 
 def _get_cached_context(customer_id: str):
@@ -44,13 +50,18 @@ def _get_cached_context(customer_id: str):
 
 def _set_cached_context(customer_id: str, result):
     """Cache context result."""
+    now = time.time()
+    # Drop expired entries from the front (only the expired ones are visited)
+    while _context_cache and now - next(iter(_context_cache.values()))[1] >= CONTEXT_CACHE_TTL:
+        _context_cache.popitem(last=False)
+
     # Limit cache size
     if len(_context_cache) > MAX_CACHE_SIZE:
         # Remove oldest entries
-        oldest = sorted(_context_cache.items(), key=lambda x: x[1][1])[:CACHE_EVICTION_BATCH]
-        for k, _ in oldest:
-            del _context_cache[k]
-    _context_cache[customer_id] = (result, time.time())
+        for _ in range(min(CACHE_EVICTION_BATCH, len(_context_cache))):
+            _context_cache.popitem(last=False)
+    _context_cache[customer_id] = (result, now)
+    _context_cache.move_to_end(customer_id)
 
 
 def invalidate_context_cache(customer_id: str):
@@ -189,7 +200,7 @@ async def retrieve_context(
         customer_ids.append(customer.primary_id)
         if customer.linked_ids:
             customer_ids.extend(customer.linked_ids)
-    customer_ids = list(set(customer_ids))  # Remove duplicates
+    customer_ids = list(dict.fromkeys(customer_ids))  # Remove duplicates, keep order
 
     # Get conversation history
     stmt = (
@@ -275,9 +286,9 @@ def build_customer_metadata(
 def extract_phone_from_conversations(conversations: List[Conversation]) -> Optional[str]:
     """Extract phone number from conversation history."""
     for conv in reversed(conversations):  # Most recent first
-        matches = re.findall(PHONE_PATTERN, conv.message)
-        if matches:
-            phone = matches[0]
+        match = _PHONE_RE.search(conv.message)
+        if match:
+            phone = match.group(0)
             # Normalize to +20 format
             if phone.startswith("01"):
                 phone = "+20" + phone[1:]
@@ -293,8 +304,8 @@ def extract_name_from_conversations(conversations: List[Conversation]) -> Option
     """Extract customer name from conversation history."""
     for conv in reversed(conversations):
         if conv.direction == "incoming":
-            for pattern in NAME_PATTERNS:
-                match = re.search(pattern, conv.message, re.IGNORECASE)
+            for pattern in _NAME_RES:
+                match = pattern.search(conv.message)
                 if match:
                     return match.group(1).strip()
     return None
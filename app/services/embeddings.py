@@ -2,15 +2,81 @@
 Embedding service with OpenAI and local model support.
 Supports multilingual embeddings (Arabic, English, Franco-Arabic).
 """
+import asyncio
 import logging
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
 import numpy as np
 from app.core.config import get_settings
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embed calls into one batch call.
+
+    The first request opens a short window (max_wait_ms); everything that arrives
+    before it closes, or until max_batch texts are queued, is embedded together.
+    Identical texts within a batch are embedded once.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]],
+        max_batch: int = 16,
+        max_wait_ms: float = 5.0
+    ):
+        self._embed_batch = embed_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> List[float]:
+        """Queue text for the next batch and wait for its embedding."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            # Keep a reference so the task isn't garbage-collected mid-flight
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            embeddings = await self._embed_batch(texts)
+            by_text = dict(zip(texts, embeddings))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug("Embedded batch of %d texts for %d callers", len(texts), len(batch))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
+
+
 class EmbeddingService:
     """
     Unified embedding service supporting:
@@ -44,15 +110,50 @@ class EmbeddingService:
         if self._use_local or not self._openai_client:
             self._init_local_model()
 
+        # Concurrent single-text requests share one batch call. An OpenAI request
+        # costs about one round trip whether it carries 1 input or 100, while local
+        # encoding time grows with the batch, so the API gets a larger cap.
+        self._batcher: Optional[EmbeddingBatcher] = None
+        if self.settings.embedding_batch_max_size > 1:
+            max_batch = (
+                self.settings.embedding_batch_max_size
+                if self._use_local or not self._openai_client
+                else self.settings.embedding_openai_batch_max_size
+            )
+            self._batcher = EmbeddingBatcher(
+                self.embed_batch,
+                max_batch=max_batch,
+                max_wait_ms=self.settings.embedding_batch_wait_ms
+            )
+
+        # Recent query vectors, stored as float32 arrays (a quarter of a list of floats)
+        self._cache = TTLCache(
+            maxsize=self.settings.embedding_cache_size,
+            ttl=self.settings.embedding_cache_ttl_seconds
+        )
+        # Texts currently being embedded, so identical concurrent calls share one
+        self._inflight: Dict[str, asyncio.Future] = {}
+
     def _init_local_model(self):
         """Initialize local Sentence Transformer model."""
         try:
+            import torch
             from sentence_transformers import SentenceTransformer
             logger.info(f"Loading local embedding model: {self.settings.local_embedding_model}")
             self._local_model = SentenceTransformer(self.settings.local_embedding_model)
-            # Detect actual dimension from model
-            test_embed = self._local_model.encode("test", convert_to_numpy=True)
-            self._actual_dimension = len(test_embed)
+            self._local_model.eval()
+            if self._local_model.device.type == "cuda":
+                # Half precision on GPU: half the activation memory, tensor-core matmuls
+                self._local_model.half()
+            # No autograd bookkeeping during encoding
+            self._inference_mode = torch.inference_mode
+
+            # Detect actual dimension from model (from its config; encode only as a fallback)
+            self._actual_dimension = self._local_model.get_sentence_embedding_dimension()
+            if self._actual_dimension is None:
+                with self._inference_mode():
+                    test_embed = self._local_model.encode("test", convert_to_numpy=True)
+                self._actual_dimension = len(test_embed)
             logger.info(f"Local embedding model loaded successfully (dimension: {self._actual_dimension})")
         except Exception as e:
             logger.error(f"Failed to load local embedding model: {e}")
@@ -61,6 +162,8 @@ class EmbeddingService:
     async def embed_text(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
+        Repeated texts are served from a TTL cache, and identical concurrent
+        calls wait on a single embedding.
 
         Args:
             text: Input text to embed
@@ -71,6 +174,36 @@ class EmbeddingService:
         if not text or not text.strip():
             raise ValueError("Text cannot be empty")
 
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached.tolist()
+
+        inflight = self._inflight.get(text)
+        if inflight is not None:
+            shared = await asyncio.shield(inflight)
+            if shared is not None:
+                return shared.tolist()
+            # The embedding we waited on failed; compute our own below
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[text] = future
+        try:
+            embedding = await self._embed_uncached(text)
+            vector = np.asarray(embedding, dtype=np.float32)
+            self._cache.set(text, vector)
+            future.set_result(vector)
+            # Same float32 values as a cache hit or a shared in-flight result
+            return vector.tolist()
+        finally:
+            if not future.done():
+                future.set_result(None)
+            self._inflight.pop(text, None)
+
+    async def _embed_uncached(self, text: str) -> List[float]:
+        """Embed a single text (through the batcher when enabled)."""
+        if self._batcher is not None:
+            return await self._batcher.embed(text)
+
         if self._use_local or not self._openai_client:
             return self._embed_local(text)
         else:
@@ -107,7 +240,7 @@ class EmbeddingService:
                 input=text
             )
             embedding = response.data[0].embedding
-            logger.debug(f"Generated OpenAI embedding, dimension: {len(embedding)}")
+            logger.debug("Generated OpenAI embedding, dimension: %d", len(embedding))
             return embedding
         except Exception as e:
             logger.error(f"OpenAI embedding failed: {e}, falling back to local model")
@@ -124,7 +257,7 @@ class EmbeddingService:
                 input=texts
             )
             embeddings = [item.embedding for item in response.data]
-            logger.debug(f"Generated {len(embeddings)} OpenAI embeddings")
+            logger.debug("Generated %d OpenAI embeddings", len(embeddings))
             return embeddings
         except Exception as e:
             logger.error(f"OpenAI batch embedding failed: {e}, falling back to local model")
@@ -136,7 +269,8 @@ class EmbeddingService:
     def _embed_local(self, text: str) -> List[float]:
         """Generate embedding using local Sentence Transformer."""
         try:
-            embedding = self._local_model.encode(text, convert_to_numpy=True)
+            with self._inference_mode():
+                embedding = self._local_model.encode(text, convert_to_numpy=True)
             return embedding.tolist()
         except Exception as e:
             logger.error(f"Local embedding failed: {e}")
@@ -145,7 +279,8 @@ class EmbeddingService:
     def _embed_local_batch(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for batch using local model."""
         try:
-            embeddings = self._local_model.encode(texts, convert_to_numpy=True)
+            with self._inference_mode():
+                embeddings = self._local_model.encode(texts, convert_to_numpy=True)
             return embeddings.tolist()
         except Exception as e:
             logger.error(f"Local batch embedding failed: {e}")
@@ -172,30 +307,27 @@ class EmbeddingService:
             # OpenAI text-embedding-3-small dimension
             return 1536
 
-    async def similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
+    def similarity(self, embedding1: Sequence[float], embedding2: Sequence[float]) -> float:
         """
         Calculate cosine similarity between two embeddings.
 
         Args:
-            embedding1: First embedding vector
-            embedding2: Second embedding vector
+            embedding1: First embedding vector (list or float32 array)
+            embedding2: Second embedding vector (list or float32 array)
 
         Returns:
             Similarity score between 0 and 1
         """
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
+        # float32 matches the models' output precision; asarray doesn't copy float32 arrays
+        vec1 = np.asarray(embedding1, dtype=np.float32)
+        vec2 = np.asarray(embedding2, dtype=np.float32)
 
         # Cosine similarity
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-
-        if norm1 == 0 or norm2 == 0:
+        norms = np.linalg.norm(vec1) * np.linalg.norm(vec2)
+        if norms == 0:
             return 0.0
 
-        similarity = dot_product / (norm1 * norm2)
-        return float(similarity)
+        return float(np.dot(vec1, vec2) / norms)
 
 
 # Global singleton instance
@@ -31,7 +31,7 @@ class IngestionService:
 
     def _generate_id(self, content: str) -> str:
         """Generate a unique ID for a document based on its content."""
-        return hashlib.md5(content.encode()).hexdigest()
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
 
     def _create_product_text(self, product: Product) -> str:
         """
@@ -3,8 +3,9 @@ Hybrid intent classification service.
 Uses rule-based patterns for speed, with entity extraction.
 """
 import re
-from typing import List, Optional, Tuple, Dict
+from typing import List, Optional, Set, Tuple, Dict
 from app.schemas import IntentClassifyResponse, ExtractedEntities
+from app.utils.keyword_matcher import KeywordMatcher
 import logging
 
 logger = logging.getLogger(__name__)
@@ -103,60 +104,131 @@ INTENT_PATTERNS = {
     }
 }
 
-# Entity extraction patterns
+# Single-pass matcher over every intent keyword (plain substrings, as before)
+_INTENT_MATCHER = KeywordMatcher({
+    "intent": {name: data["keywords"] for name, data in INTENT_PATTERNS.items()}
+})
+# First character of every keyword, in both cases: a message sharing none of
+# them can't match any
+_INTENT_FIRST_CHARS = frozenset(
+    char
+    for data in INTENT_PATTERNS.values() for keyword in data["keywords"]
+    for char in (keyword[0].lower(), keyword[0].upper())
+)
+# Most specific intent wins: lowest priority, then declaration order
+_INTENT_RANK = {
+    name: (data["priority"], i) for i, (name, data) in enumerate(INTENT_PATTERNS.items())
+}
+
+# Intents whose confidence is boosted by a product mention
+_PRODUCT_INTENTS = frozenset({"order_intent", "price_inquiry", "availability_check"})
+# Canned-reply intents that give way to the AI when products are mentioned
+_SOCIAL_INTENTS = frozenset({"greeting", "thanks", "goodbye"})
+
+# Entity extraction patterns (compiled once at import)
 PHONE_PATTERNS = [
-    r'(?:\+?20|0)?1[0125]\d{8}',  # Egyptian phone numbers
-    r'\+?\d{10,15}'  # General international format
+    re.compile(r'(?:\+?20|0)?1[0125]\d{8}'),  # Egyptian phone numbers
+    re.compile(r'\+?\d{10,15}')  # General international format
 ]
 
 SIZE_PATTERNS = [
-    (r'\b(xs|XS)\b', "XS"),
-    (r'\b(s|S|small|صغير)\b', "S"),
-    (r'\b(m|M|medium|وسط)\b', "M"),
-    (r'\b(l|L|large|كبير)\b', "L"),
-    (r'\b(xl|XL)\b', "XL"),
-    (r'\b(xxl|XXL|2xl)\b', "XXL"),
-    (r'\b(xxxl|XXXL|3xl)\b', "XXXL"),
-    (r'\bsize\s*(\d{2})\b', None),  # Numeric size
-    (r'\b(\d{2})\b', None),  # Standalone number (could be size)
+    (re.compile(r'\b(xs|XS)\b', re.IGNORECASE), "XS"),
+    (re.compile(r'\b(s|S|small|صغير)\b', re.IGNORECASE), "S"),
+    (re.compile(r'\b(m|M|medium|وسط)\b', re.IGNORECASE), "M"),
+    (re.compile(r'\b(l|L|large|كبير)\b', re.IGNORECASE), "L"),
+    (re.compile(r'\b(xl|XL)\b', re.IGNORECASE), "XL"),
+    (re.compile(r'\b(xxl|XXL|2xl)\b', re.IGNORECASE), "XXL"),
+    (re.compile(r'\b(xxxl|XXXL|3xl)\b', re.IGNORECASE), "XXXL"),
+    (re.compile(r'\bsize\s*(\d{2})\b', re.IGNORECASE), None),  # Numeric size
+    (re.compile(r'\b(\d{2})\b'), None),  # Standalone number (could be size)
 ]
 
 COLOR_PATTERNS = {
-    "black": [r'\b(black|اسود|أسود|eswed|aswad)\b'],
-    "white": [r'\b(white|ابيض|أبيض|abyad|abyed)\b'],
-    "red": [r'\b(red|احمر|أحمر|a7mar|ahmar)\b'],
-    "blue": [r'\b(blue|ازرق|أزرق|azra2|azraq)\b'],
-    "green": [r'\b(green|اخضر|أخضر|akhdar|a5dar)\b'],
-    "yellow": [r'\b(yellow|اصفر|أصفر|asfar)\b'],
-    "brown": [r'\b(brown|بني|bonny|bunni)\b'],
-    "gray": [r'\b(gray|grey|رمادي|رصاصي|rasasi)\b'],
-    "pink": [r'\b(pink|وردي|زهري|wardy)\b'],
-    "orange": [r'\b(orange|برتقالي|borto2aly)\b'],
-    "navy": [r'\b(navy|كحلي|كحل|ka7ly)\b'],
-    "beige": [r'\b(beige|بيج|بيچ)\b'],
+    "black": [re.compile(r'\b(black|اسود|أسود|eswed|aswad)\b', re.IGNORECASE)],
+    "white": [re.compile(r'\b(white|ابيض|أبيض|abyad|abyed)\b', re.IGNORECASE)],
+    "red": [re.compile(r'\b(red|احمر|أحمر|a7mar|ahmar)\b', re.IGNORECASE)],
+    "blue": [re.compile(r'\b(blue|ازرق|أزرق|azra2|azraq)\b', re.IGNORECASE)],
+    "green": [re.compile(r'\b(green|اخضر|أخضر|akhdar|a5dar)\b', re.IGNORECASE)],
+    "yellow": [re.compile(r'\b(yellow|اصفر|أصفر|asfar)\b', re.IGNORECASE)],
+    "brown": [re.compile(r'\b(brown|بني|bonny|bunni)\b', re.IGNORECASE)],
+    "gray": [re.compile(r'\b(gray|grey|رمادي|رصاصي|rasasi)\b', re.IGNORECASE)],
+    "pink": [re.compile(r'\b(pink|وردي|زهري|wardy)\b', re.IGNORECASE)],
+    "orange": [re.compile(r'\b(orange|برتقالي|borto2aly)\b', re.IGNORECASE)],
+    "navy": [re.compile(r'\b(navy|كحلي|كحل|ka7ly)\b', re.IGNORECASE)],
+    "beige": [re.compile(r'\b(beige|بيج|بيچ)\b', re.IGNORECASE)],
 }
 
+_DIGIT_RE = re.compile(r'\d')
+
 QUANTITY_PATTERNS = [
-    r'(\d+)\s*(?:pieces?|pcs?|قطعة|قطع)',
-    r'(\d+)\s*(?:items?|حتة|حبة)',
-    r'quantity[:\s]+(\d+)',
-    r'عدد[:\s]+(\d+)',
-    r'^(\d+)$',  # Standalone number in context
+    re.compile(r'(\d+)\s*(?:pieces?|pcs?|قطعة|قطع)', re.IGNORECASE),
+    re.compile(r'(\d+)\s*(?:items?|حتة|حبة)', re.IGNORECASE),
+    re.compile(r'quantity[:\s]+(\d+)', re.IGNORECASE),
+    re.compile(r'عدد[:\s]+(\d+)'),
+    re.compile(r'^(\d+)$'),  # Standalone number in context
 ]
 
 PRODUCT_NAME_PATTERNS = {
-    "jeans": [r'\b(jeans|جينز|جينس|jeanz|denim)\b'],
-    "pants": [r'\b(pants|بنطلون|pantalon|trousers)\b'],
-    "hoodie": [r'\b(hoodie|هودي|هوديز|hoody|sweatshirt)\b'],
-    "shirt": [r'\b(shirt|شيرت|قميص|t-shirt|tshirt|tee)\b'],
-    "jacket": [r'\b(jacket|جاكيت|جاكت|coat)\b'],
-    "shoes": [r'\b(shoes|حذاء|جزمة|7ezaa2|gizma|sneakers)\b'],
-    "dress": [r'\b(dress|فستان|fostan)\b'],
-    "shorts": [r'\b(shorts|شورت|short)\b'],
-    "bag": [r'\b(bag|شنطة|حقيبة|shanta)\b'],
+    "jeans": [re.compile(r'\b(jeans|جينز|جينس|jeanz|denim)\b', re.IGNORECASE)],
+    "pants": [re.compile(r'\b(pants|بنطلون|pantalon|trousers)\b', re.IGNORECASE)],
+    "hoodie": [re.compile(r'\b(hoodie|هودي|هوديز|hoody|sweatshirt)\b', re.IGNORECASE)],
+    "shirt": [re.compile(r'\b(shirt|شيرت|قميص|t-shirt|tshirt|tee)\b', re.IGNORECASE)],
+    "jacket": [re.compile(r'\b(jacket|جاكيت|جاكت|coat)\b', re.IGNORECASE)],
+    "shoes": [re.compile(r'\b(shoes|حذاء|جزمة|7ezaa2|gizma|sneakers)\b', re.IGNORECASE)],
+    "dress": [re.compile(r'\b(dress|فستان|fostan)\b', re.IGNORECASE)],
+    "shorts": [re.compile(r'\b(shorts|شورت|short)\b', re.IGNORECASE)],
+    "bag": [re.compile(r'\b(bag|شنطة|حقيبة|shanta)\b', re.IGNORECASE)],
 }
 
 
+def _build_entity_regex() -> Tuple[re.Pattern, Dict[str, Tuple[str, int, Optional[str]]]]:
+    """
+    Fuse the size, color and product patterns into one alternation.
+    Each pattern becomes a named group mapped to (field, rank, value); rank is
+    the pattern's position in its table, so the earliest-listed match still wins.
+    """
+    entries = [("size", pattern, value) for pattern, value in SIZE_PATTERNS]
+    entries += [
+        ("color", pattern, name)
+        for name, patterns in COLOR_PATTERNS.items() for pattern in patterns
+    ]
+    entries += [
+        ("product_name", pattern, name)
+        for name, patterns in PRODUCT_NAME_PATTERNS.items() for pattern in patterns
+    ]
+
+    groups: Dict[str, Tuple[str, int, Optional[str]]] = {}
+    alternatives = []
+    ranks: Dict[str, int] = {}
+    for field, pattern, value in entries:
+        rank = ranks.get(field, 0)
+        ranks[field] = rank + 1
+        group = f"{field}_{rank}"
+        groups[group] = (field, rank, value)
+        alternatives.append(f"(?P<{group}>{pattern.pattern})")
+    return re.compile("|".join(alternatives), re.IGNORECASE), groups
+
+
+# One scan finds size, color and product together
+_ENTITY_RE, _ENTITY_GROUPS = _build_entity_regex()
+
+# Shared result for messages with no entities (greetings, thanks, ...); read-only
+_EMPTY_ENTITIES = ExtractedEntities.model_construct(
+    product_name=None, size=None, color=None, quantity=None, phone=None
+)
+
+
+def _match_intents(message: str) -> Set[str]:
+    """Return the intents with a keyword in message (case-insensitive)."""
+    # ASCII case mapping is one-to-one, so ASCII text is screened before it is lowercased
+    if message.isascii() and _INTENT_FIRST_CHARS.isdisjoint(message):
+        return set()
+    message_lower = message.lower()
+    if _INTENT_FIRST_CHARS.isdisjoint(message_lower):
+        return set()
+    return _INTENT_MATCHER.match(message_lower).get("intent", set())
+
+
 def classify_intent(
     message: str,
     context: Optional[List[str]] = None
@@ -167,31 +239,21 @@ def classify_intent(
     Returns:
         IntentClassifyResponse with intent, confidence, entities, and suggested response
     """
-    logger.info(f"Classifying intent for: {message[:100]}...")
-
-    message_lower = message.lower()
+    logger.info("Classifying intent for: %.100s...", message)
 
     # Try to match intents
     matched_intent = None
-    matched_priority = 999
     confidence = 0.0
     skip_ai = False
     suggested_response = None
 
-    for intent_name, intent_data in INTENT_PATTERNS.items():
-        keywords = intent_data["keywords"]
-        priority = intent_data["priority"]
-
-        for keyword in keywords:
-            if keyword.lower() in message_lower:
-                # Higher match = lower priority number = more specific
-                if priority < matched_priority:
-                    matched_intent = intent_name
-                    matched_priority = priority
-                    skip_ai = intent_data.get("skip_ai", False)
-                    suggested_response = intent_data.get("suggested_response")
-                    confidence = 0.85 if priority == 1 else 0.75
-                break
+    matched = _match_intents(message)
+    if matched:
+        matched_intent = min(matched, key=_INTENT_RANK.__getitem__)
+        intent_data = INTENT_PATTERNS[matched_intent]
+        skip_ai = intent_data.get("skip_ai", False)
+        suggested_response = intent_data.get("suggested_response")
+        confidence = 0.85 if intent_data["priority"] == 1 else 0.75
 
     # Default to general_inquiry if no match
     if not matched_intent:
@@ -203,22 +265,23 @@ def classify_intent(
     entities = extract_entities(message)
 
     # Boost confidence if we found relevant entities
-    if entities.product_name and matched_intent in ["order_intent", "price_inquiry", "availability_check"]:
+    if entities.product_name and matched_intent in _PRODUCT_INTENTS:
         confidence = min(confidence + 0.1, 0.95)
 
     # Adjust skip_ai based on entities
     # If we have specific product/order info, let AI handle it
     if entities.product_name or entities.size or entities.color:
-        if matched_intent in ["greeting", "thanks", "goodbye"]:
+        if matched_intent in _SOCIAL_INTENTS:
             # Customer is greeting but also mentioning products
             matched_intent = "general_inquiry"
             skip_ai = False
             suggested_response = None
             confidence = 0.7
 
-    logger.info(f"Classified as: {matched_intent} (confidence: {confidence:.2f})")
+    logger.info("Classified as: %s (confidence: %.2f)", matched_intent, confidence)
 
-    return IntentClassifyResponse(
+    # Every field is produced here from trusted tables: skip validation
+    return IntentClassifyResponse.model_construct(
         intent=matched_intent,
         confidence=confidence,
         entities=entities,
@@ -229,65 +292,58 @@ def classify_intent(
 
 def extract_entities(message: str) -> ExtractedEntities:
     """Extract entities (product, size, color, quantity, phone) from message."""
-    product_name = None
-    size = None
-    color = None
     quantity = None
     phone = None
 
+    # Phone and quantity patterns all need a digit (\d, so Arabic-Indic too)
+    has_digits = _DIGIT_RE.search(message) is not None
+
     # Extract phone
-    for pattern in PHONE_PATTERNS:
-        match = re.search(pattern, message)
-        if match:
-            phone = match.group(0)
-            # Normalize Egyptian phone
-            if phone.startswith("01"):
-                phone = "+20" + phone[1:]
-            elif phone.startswith("1") and len(phone) == 10:
-                phone = "+20" + phone
-            break
-
-    # Extract size
-    for pattern, fixed_size in SIZE_PATTERNS:
-        match = re.search(pattern, message, re.IGNORECASE)
-        if match:
-            if fixed_size:
-                size = fixed_size
-            else:
-                size = match.group(1).upper()
-            break
-
-    # Extract color
-    for color_name, patterns in COLOR_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                color = color_name
-                break
-        if color:
-            break
-
-    # Extract product name
-    for product, patterns in PRODUCT_NAME_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                product_name = product
+    if has_digits:
+        for pattern in PHONE_PATTERNS:
+            match = pattern.search(message)
+            if match:
+                phone = match.group(0)
+                # Normalize Egyptian phone
+                if phone.startswith("01"):
+                    phone = "+20" + phone[1:]
+                elif phone.startswith("1") and len(phone) == 10:
+                    phone = "+20" + phone
                 break
-        if product_name:
-            break
+
+    # Extract size, color and product in one pass; per field, the match from
+    # the earliest-listed pattern wins regardless of its position in the message
+    best: Dict[str, Tuple[int, str]] = {}
+    for match in _ENTITY_RE.finditer(message):
+        field, rank, value = _ENTITY_GROUPS[match.lastgroup]
+        if field in best and best[field][0] <= rank:
+            continue
+        if value is None:
+            # Numeric size: the pattern's own capture group follows the named group
+            value = match.group(match.lastindex + 1).upper()
+        best[field] = (rank, value)
+
+    size = best["size"][1] if "size" in best else None
+    color = best["color"][1] if "color" in best else None
+    product_name = best["product_name"][1] if "product_name" in best else None
 
     # Extract quantity
-    for pattern in QUANTITY_PATTERNS:
-        match = re.search(pattern, message, re.IGNORECASE)
-        if match:
-            try:
-                qty = int(match.group(1))
-                if 1 <= qty <= 100:  # Reasonable quantity range
-                    quantity = qty
-                    break
-            except ValueError:
-                pass
-
-    return ExtractedEntities(
+    if has_digits:
+        for pattern in QUANTITY_PATTERNS:
+            match = pattern.search(message)
+            if match:
+                try:
+                    qty = int(match.group(1))
+                    if 1 <= qty <= 100:  # Reasonable quantity range
+                        quantity = qty
+                        break
+                except ValueError:
+                    pass
+
+    if not best and phone is None and quantity is None:
+        return _EMPTY_ENTITIES
+
+    return ExtractedEntities.model_construct(
         product_name=product_name,
         size=size,
         color=color,
@@ -2,65 +2,126 @@
 Multilingual product search service (RAG-lite).
 """
 import re
-from typing import List, Tuple, Set
-from sqlalchemy import select, or_, func
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from sqlalchemy import select, or_, any_, bindparam, cast, Integer, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 from app.models import Product
 from app.schemas import ProductInfo, SearchMetadata, ProductSearchResponse
+from app.utils.keyword_matcher import KeywordMatcher
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Multilingual keyword dictionaries
+# Multilingual keyword dictionaries (read-only: the matcher below indexes them at import)
 PRODUCT_KEYWORDS = {
     # Clothing items - mapped to English search terms
-    "jeans": ["jeans", "جينز", "جينس", "jeanz", "denim"],
-    "pants": ["pants", "بنطلون", "بنطلونات", "pantalon", "bantalon", "trousers"],
-    "hoodie": ["hoodie", "هودي", "هوديز", "hoody", "sweatshirt"],
-    "shirt": ["shirt", "شيرت", "قميص", "shert", "t-shirt", "tshirt", "tee"],
-    "jacket": ["jacket", "جاكيت", "جاكت", "jaket", "coat"],
-    "shoes": ["shoes", "حذاء", "جزمة", "shoe", "7ezaa2", "gizma", "sneakers"],
-    "dress": ["dress", "فستان", "fostan", "dresses"],
-    "skirt": ["skirt", "جيبة", "jiba", "skirts"],
-    "shorts": ["shorts", "شورت", "short"],
-    "sweater": ["sweater", "سويتر", "pullover"],
-    "bag": ["bag", "شنطة", "حقيبة", "shanta", "bags"],
-    "cap": ["cap", "كاب", "طاقية", "hat"],
+    "jeans": ("jeans", "جينز", "جينس", "jeanz", "denim"),
+    "pants": ("pants", "بنطلون", "بنطلونات", "pantalon", "bantalon", "trousers"),
+    "hoodie": ("hoodie", "هودي", "هوديز", "hoody", "sweatshirt"),
+    "shirt": ("shirt", "شيرت", "قميص", "shert", "t-shirt", "tshirt", "tee"),
+    "jacket": ("jacket", "جاكيت", "جاكت", "jaket", "coat"),
+    "shoes": ("shoes", "حذاء", "جزمة", "shoe", "7ezaa2", "gizma", "sneakers"),
+    "dress": ("dress", "فستان", "fostan", "dresses"),
+    "skirt": ("skirt", "جيبة", "jiba", "skirts"),
+    "shorts": ("shorts", "شورت", "short"),
+    "sweater": ("sweater", "سويتر", "pullover"),
+    "bag": ("bag", "شنطة", "حقيبة", "shanta", "bags"),
+    "cap": ("cap", "كاب", "طاقية", "hat"),
 }
 
 # Color mappings
 COLOR_KEYWORDS = {
-    "black": ["black", "اسود", "أسود", "eswed", "aswad"],
-    "white": ["white", "ابيض", "أبيض", "abyad", "abyed"],
-    "red": ["red", "احمر", "أحمر", "a7mar", "ahmar"],
-    "blue": ["blue", "ازرق", "أزرق", "azra2", "azraq"],
-    "green": ["green", "اخضر", "أخضر", "akhdar", "a5dar"],
-    "yellow": ["yellow", "اصفر", "أصفر", "asfar"],
-    "brown": ["brown", "بني", "bonny", "bunni"],
-    "gray": ["gray", "grey", "رمادي", "رصاصي", "grey", "rasasi"],
-    "pink": ["pink", "وردي", "زهري", "wardy", "baby"],
-    "orange": ["orange", "برتقالي", "borto2aly"],
-    "navy": ["navy", "كحلي", "كحل", "ka7ly"],
-    "beige": ["beige", "بيج", "بيچ"],
+    "black": ("black", "اسود", "أسود", "eswed", "aswad"),
+    "white": ("white", "ابيض", "أبيض", "abyad", "abyed"),
+    "red": ("red", "احمر", "أحمر", "a7mar", "ahmar"),
+    "blue": ("blue", "ازرق", "أزرق", "azra2", "azraq"),
+    "green": ("green", "اخضر", "أخضر", "akhdar", "a5dar"),
+    "yellow": ("yellow", "اصفر", "أصفر", "asfar"),
+    "brown": ("brown", "بني", "bonny", "bunni"),
+    "gray": ("gray", "grey", "رمادي", "رصاصي", "grey", "rasasi"),
+    "pink": ("pink", "وردي", "زهري", "wardy", "baby"),
+    "orange": ("orange", "برتقالي", "borto2aly"),
+    "navy": ("navy", "كحلي", "كحل", "ka7ly"),
+    "beige": ("beige", "بيج", "بيچ"),
 }
 
-# Size patterns
+# Single-pass matcher over every product-type and color variant
+# (ASCII variants must start a word, so "hat" in "what" or "red" in "ordered" don't match)
+_KEYWORD_MATCHER = KeywordMatcher({
+    "product": PRODUCT_KEYWORDS,
+    "color": COLOR_KEYWORDS,
+}, ascii_word_start=True)
+
+# Size patterns (compiled once at import)
 SIZE_PATTERNS = [
-    r'\b(xs|s|m|l|xl|xxl|xxxl)\b',
-    r'\b(\d{2})\b',  # Numeric sizes like 32, 34, etc.
-    r'\b(small|medium|large)\b',
-    r'\b(صغير|وسط|كبير)\b',  # Arabic sizes
+    re.compile(r'\b(xs|s|m|l|xl|xxl|xxxl)\b', re.IGNORECASE),
+    re.compile(r'\b(\d{2})\b'),  # Numeric sizes like 32, 34, etc.
+    re.compile(r'\b(small|medium|large)\b', re.IGNORECASE),
+    re.compile(r'\b(صغير|وسط|كبير)\b'),  # Arabic sizes
 ]
 
-
+_ARABIC_CHAR_RE = re.compile(r'[\u0600-\u06FF]')
+_ARABIC_CHARS = frozenset(map(chr, range(0x0600, 0x0700)))
+_LATIN_LETTERS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+# Keyword search statements are built once with array parameters, so every search
+# sends the same SQL text: SQLAlchemy's compiled cache and asyncpg's prepared
+# statement cache are reused regardless of how many keywords a query has.
+# Only the columns callers read are selected: rows come back as lightweight Row
+# tuples instead of ORM instances with identity-map and change-tracking state.
+_PATTERNS_PARAM = bindparam("patterns", type_=ARRAY(String))
+# Postgres has no text[] && varchar[] operator: colors is TEXT[] in the Supabase table,
+# so both sides are compared as TEXT[] (the cast is a no-op there and keeps the GIN
+# index usable; it also covers VARCHAR[] tables built by create_all in development)
+_COLORS_PARAM = bindparam("colors", type_=ARRAY(Text))
+_SEARCH_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.price,
+    Product.sizes,
+    Product.colors,
+    Product.stock_count,
+    Product.description,
+)
+
+KEYWORD_SEARCH_STMT = (
+    select(*_SEARCH_COLUMNS)
+    .where(Product.is_active == True)
+    .where(or_(
+        Product.name.ilike(any_(_PATTERNS_PARAM)),
+        Product.description.ilike(any_(_PATTERNS_PARAM)),
+        cast(Product.colors, ARRAY(Text)).overlap(_COLORS_PARAM),
+    ))
+    .order_by(Product.stock_count.desc())
+    .limit(bindparam("limit", type_=Integer))
+)
+
+TOP_PRODUCTS_STMT = (
+    select(*_SEARCH_COLUMNS)
+    .where(Product.is_active == True)
+    .order_by(Product.stock_count.desc())
+    .limit(bindparam("limit", type_=Integer))
+)
+
+
+@lru_cache(maxsize=4096)
 def detect_language(text: str) -> str:
-    """Detect language of the input text."""
-    arabic_chars = len(re.findall(r'[\u0600-\u06FF]', text))
-    total_chars = len(re.findall(r'[a-zA-Z\u0600-\u06FF]', text))
+    """Detect language of the input text (memoized; chat messages repeat often)."""
+    # Pure-ASCII text has no Arabic letters, so it is English (or empty) either way
+    if text.isascii():
+        return "en"
 
-    if total_chars == 0:
+    # No Arabic letters at all: English (a single C-level scan that stops at the first hit)
+    if _ARABIC_CHAR_RE.search(text) is None:
         return "en"
 
+    # Count script membership with hashed set lookups instead of regex matching
+    arabic_chars = sum(map(_ARABIC_CHARS.__contains__, text))
+    total_chars = arabic_chars + sum(map(_LATIN_LETTERS.__contains__, text))
+
     arabic_ratio = arabic_chars / total_chars
 
     if arabic_ratio > 0.5:
@@ -71,41 +132,72 @@ def detect_language(text: str) -> str:
         return "en"
 
 
-def extract_product_keywords(query: str) -> Tuple[Set[str], Set[str]]:
-    """Extract product type and color keywords from query in any language."""
+class QueryAnalysis(NamedTuple):
+    """Everything the search path reads from a query, computed in one pass."""
+    language: str
+    product_keywords: FrozenSet[str]
+    color_keywords: FrozenSet[str]
+    size: Optional[str]
+
+
+@lru_cache(maxsize=4096)
+def analyze_query(query: str) -> QueryAnalysis:
+    """Detect language, keywords and size with a single lowercasing (memoized)."""
     query_lower = query.lower()
-    query_words = set(re.findall(r'[\w\u0600-\u06FF]+', query_lower))
+    found = _KEYWORD_MATCHER.match(query_lower)
+    return QueryAnalysis(
+        language=detect_language(query),
+        product_keywords=frozenset(found.get("product", ())),
+        color_keywords=frozenset(found.get("color", ())),
+        size=_match_size(query_lower),
+    )
 
-    matched_products = set()
-    matched_colors = set()
 
-    # Find product types
-    for product_key, variants in PRODUCT_KEYWORDS.items():
-        for variant in variants:
-            if variant.lower() in query_lower or variant.lower() in query_words:
-                matched_products.add(product_key)
-                break
+def _match_size(query_lower: str) -> Optional[str]:
+    """Return the first size found in a lowercased query."""
+    for pattern in SIZE_PATTERNS:
+        match = pattern.search(query_lower)
+        if match:
+            return match.group(1).upper()
+
+    return None
 
-    # Find colors
-    for color_key, variants in COLOR_KEYWORDS.items():
-        for variant in variants:
-            if variant.lower() in query_lower or variant.lower() in query_words:
-                matched_colors.add(color_key)
-                break
 
-    return matched_products, matched_colors
+def extract_product_keywords(query: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Extract product type and color keywords from query in any language."""
+    analysis = analyze_query(query)
+    return analysis.product_keywords, analysis.color_keywords
 
 
 def extract_size(query: str) -> str | None:
     """Extract size from query."""
-    query_lower = query.lower()
+    return analyze_query(query).size
 
-    for pattern in SIZE_PATTERNS:
-        match = re.search(pattern, query_lower, re.IGNORECASE)
-        if match:
-            return match.group(1).upper()
 
-    return None
+def build_keyword_search(
+    query: str,
+    product_keywords: FrozenSet[str],
+    color_keywords: FrozenSet[str],
+    limit: int
+) -> Tuple[Select, Dict[str, Any]]:
+    """
+    Pick the prebuilt keyword search statement and its parameters.
+
+    Product keywords match name/description, colors match the colors array.
+    With no known keywords, query words longer than 2 chars are matched instead;
+    with nothing to match at all, the top products by stock are returned.
+    """
+    if product_keywords or color_keywords:
+        patterns = [f"%{keyword}%" for keyword in product_keywords]
+        colors = list(color_keywords)
+    else:
+        patterns = [f"%{word}%" for word in query.split() if len(word) > 2]
+        colors = []
+
+    if not patterns and not colors:
+        return TOP_PRODUCTS_STMT, {"limit": limit}
+
+    return KEYWORD_SEARCH_STMT, {"patterns": patterns, "colors": colors, "limit": limit}
 
 
 async def search_products(
@@ -122,62 +214,22 @@ async def search_products(
     3. Search database using fuzzy matching
     4. Return formatted results for AI context
     """
-    logger.info(f"Searching products with query: {query}")
-
-    # Detect language
-    detected_language = detect_language(query)
-
-    # Extract keywords
-    product_keywords, color_keywords = extract_product_keywords(query)
-    size = extract_size(query)
+    # Detect language, keywords and size
+    detected_language, product_keywords, color_keywords, size = analyze_query(query)
 
     all_keywords = list(product_keywords) + list(color_keywords)
     if size:
         all_keywords.append(size)
 
-    logger.info(f"Detected language: {detected_language}, keywords: {all_keywords}")
-
-    # Build database query
-    conditions = []
-
-    # Add product keyword conditions
-    for keyword in product_keywords:
-        conditions.append(Product.name.ilike(f"%{keyword}%"))
-        conditions.append(Product.description.ilike(f"%{keyword}%"))
-
-    # Add color conditions
-    for color in color_keywords:
-        # Check if color is in the colors array
-        conditions.append(Product.colors.any(color))
-
-    # If no specific keywords found, do a general text search
-    if not conditions:
-        query_words = query.split()
-        for word in query_words:
-            if len(word) > 2:  # Skip very short words
-                conditions.append(Product.name.ilike(f"%{word}%"))
-                conditions.append(Product.description.ilike(f"%{word}%"))
-
-    # Execute query
-    if conditions:
-        stmt = (
-            select(Product)
-            .where(Product.is_active == True)
-            .where(or_(*conditions))
-            .order_by(Product.stock_count.desc())
-            .limit(limit)
-        )
-    else:
-        # Fallback: return top products by stock
-        stmt = (
-            select(Product)
-            .where(Product.is_active == True)
-            .order_by(Product.stock_count.desc())
-            .limit(limit)
-        )
+    logger.info(
+        "Searching products with query: %s (language: %s, keywords: %s)",
+        query, detected_language, all_keywords
+    )
 
-    result = await db.execute(stmt)
-    products = result.scalars().all()
+    # Execute query (falls back to top products by stock if nothing to match)
+    stmt, params = build_keyword_search(query, product_keywords, color_keywords, limit)
+    result = await db.execute(stmt, params)
+    products = result.all()
 
     # Format products for response
     product_list = []
@@ -2,16 +2,20 @@
 RAG (Retrieval-Augmented Generation) orchestration service.
 Combines semantic search with keyword matching for optimal DM assistant responses.
 """
+import asyncio
+import heapq
 import logging
+from operator import itemgetter
 from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Product
 from app.core.config import get_settings
+from app.core.constants import RRF_K
 from app.services.embeddings import get_embedding_service
 from app.services.vector_db import get_vector_db
-from app.services.products import extract_product_keywords, extract_size, detect_language
+from app.services.products import analyze_query, build_keyword_search
+from app.utils.ttl_cache import TTLCache
+from app.utils.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -27,13 +31,32 @@ class RAGService:
         self.embedding_service = get_embedding_service()
         self.vector_db = get_vector_db()
         self.settings = settings
+        # L1 exact-match cache for hybrid search, keyed by (query, limit)
+        self._search_cache = TTLCache(
+            maxsize=settings.rag_search_cache_size,
+            ttl=settings.rag_search_cache_ttl_seconds
+        )
+        # L2 cache for paraphrased queries, keyed by query embedding
+        self._semantic_cache = SemanticCache(
+            maxsize=settings.rag_semantic_cache_size,
+            ttl=settings.rag_search_cache_ttl_seconds,
+            threshold=settings.rag_semantic_cache_threshold
+        )
+        # Searches currently running, so identical concurrent queries share one call
+        self._inflight_searches: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    def cache_clear(self) -> None:
+        """Drop cached search results (call after the product index changes)."""
+        self._search_cache.clear()
+        self._semantic_cache.clear()
 
     async def search_products_semantic(
         self,
         query: str,
         db: AsyncSession,
         limit: int = 5,
-        min_score: float = 0.7
+        min_score: float = 0.7,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Semantic product search using vector similarity.
@@ -43,6 +66,7 @@ class RAGService:
             db: Database session
             limit: Maximum number of results
             min_score: Minimum similarity score
+            query_embedding: Precomputed embedding of query (skips re-embedding)
 
         Returns:
             List of products with relevance scores
@@ -53,40 +77,40 @@ class RAGService:
                 logger.warning("Vector DB not connected, falling back to keyword search")
                 return []
 
-            # Generate query embedding
-            query_embedding = await self.embedding_service.embed_text(query)
-
-            # Search vector database
-            results = await self.vector_db.search(
-                collection_name=self.settings.qdrant_collection_products,
-                query_vector=query_embedding,
-                limit=limit,
-                score_threshold=min_score
-            )
-
-            # Format results
-            products = []
-            for result in results:
-                payload = result["payload"]
-                products.append({
-                    "id": payload.get("product_id"),
-                    "name": payload.get("name"),
-                    "price": payload.get("price"),
-                    "description": payload.get("description"),
-                    "sizes": payload.get("sizes", []),
-                    "colors": payload.get("colors", []),
-                    "stock_count": payload.get("stock_count"),
-                    "similarity_score": result["score"],
-                    "search_method": "semantic"
-                })
-
-            logger.info(f"Semantic search found {len(products)} products")
-            return products
+            return await self._search_products_semantic(query, limit, min_score, query_embedding)
 
         except Exception as e:
             logger.error(f"Semantic search failed: {e}")
             return []
 
+    async def _search_products_semantic(
+        self,
+        query: str,
+        limit: int,
+        min_score: float,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
+        """Semantic product search that raises on failure instead of returning []."""
+        if not self.vector_db.is_connected():
+            raise RuntimeError("Vector DB not connected")
+
+        # Generate query embedding
+        if query_embedding is None:
+            query_embedding = await self.embedding_service.embed_text(query)
+
+        # Search vector database
+        results = await self.vector_db.search(
+            collection_name=self.settings.qdrant_collection_products,
+            query_vector=query_embedding,
+            limit=limit,
+            score_threshold=min_score
+        )
+
+        products = [_product_from_hit(result) for result in results]
+
+        logger.info("Semantic search found %d products", len(products))
+        return products
+
     async def search_products_keyword(
         self,
         query: str,
@@ -105,120 +129,187 @@ class RAGService:
             List of products
         """
         try:
-            # Extract keywords
-            product_keywords, color_keywords = extract_product_keywords(query)
-            all_keywords = list(product_keywords) + list(color_keywords)
-
-            if not all_keywords:
-                # Fallback: use query words
-                all_keywords = [w for w in query.split() if len(w) > 2]
-
-            # Build database query
-            conditions = []
-            for keyword in product_keywords:
-                conditions.append(Product.name.ilike(f"%{keyword}%"))
-                conditions.append(Product.description.ilike(f"%{keyword}%"))
-
-            for color in color_keywords:
-                conditions.append(Product.colors.any(color))
-
-            if not conditions:
-                for word in all_keywords:
-                    conditions.append(Product.name.ilike(f"%{word}%"))
-                    conditions.append(Product.description.ilike(f"%{word}%"))
-
-            if conditions:
-                stmt = (
-                    select(Product)
-                    .where(Product.is_active == True)
-                    .where(or_(*conditions))
-                    .order_by(Product.stock_count.desc())
-                    .limit(limit)
-                )
-            else:
-                stmt = (
-                    select(Product)
-                    .where(Product.is_active == True)
-                    .order_by(Product.stock_count.desc())
-                    .limit(limit)
-                )
-
-            result = await db.execute(stmt)
-            products_db = result.scalars().all()
-
-            products = []
-            for p in products_db:
-                products.append({
-                    "id": str(p.id),
-                    "name": p.name,
-                    "price": float(p.price),
-                    "description": p.description or "",
-                    "sizes": p.sizes or [],
-                    "colors": p.colors or [],
-                    "stock_count": p.stock_count,
-                    "similarity_score": 0.5,  # Default score for keyword matches
-                    "search_method": "keyword"
-                })
-
-            logger.info(f"Keyword search found {len(products)} products")
-            return products
-
+            return await self._search_products_keyword(query, db, limit)
         except Exception as e:
             logger.error(f"Keyword search failed: {e}")
             return []
 
+    async def _search_products_keyword(
+        self,
+        query: str,
+        db: AsyncSession,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Keyword product search that raises on failure instead of returning []."""
+        # Extract keywords
+        analysis = analyze_query(query)
+
+        # Prebuilt statement; falls back to query words, then top products by stock
+        stmt, params = build_keyword_search(
+            query, analysis.product_keywords, analysis.color_keywords, limit
+        )
+        result = await db.execute(stmt, params)
+        products_db = result.all()
+
+        products = []
+        for p in products_db:
+            products.append({
+                "id": str(p.id),
+                "name": p.name,
+                "price": float(p.price),
+                "description": p.description or "",
+                "sizes": p.sizes or [],
+                "colors": p.colors or [],
+                "stock_count": p.stock_count,
+                "similarity_score": 0.5,  # Default score for keyword matches
+                "search_method": "keyword"
+            })
+
+        logger.info("Keyword search found %d products", len(products))
+        return products
+
     async def search_products_hybrid(
         self,
         query: str,
         db: AsyncSession,
-        limit: int = 5
+        limit: int = 5,
+        query_embedding: Optional[List[float]] = None
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Hybrid search combining semantic and keyword approaches.
+        Repeated queries are served from a short-lived exact-match cache, and
+        identical concurrent queries wait on a single upstream search.
+        Results where a search leg failed are returned but never cached.
+        Pass query_embedding if the caller already embedded the query.
+        """
+        key = (query, limit)
+
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            return _clone_search_result(cached)
+
+        inflight = self._inflight_searches.get(key)
+        if inflight is not None:
+            shared = await asyncio.shield(inflight)
+            if shared is not None:
+                return _clone_search_result(shared)
+            # The search we waited on failed; run our own below
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_searches[key] = future
+        try:
+            products, metadata, complete = await self._search_products_hybrid(
+                query, db, limit, query_embedding
+            )
+            result = (products, metadata)
+            if complete:
+                self._search_cache.set(key, result)
+            future.set_result(result)
+            return _clone_search_result(result)
+        finally:
+            if not future.done():
+                future.set_result(None)
+            self._inflight_searches.pop(key, None)
+
+    async def _search_products_hybrid(
+        self,
+        query: str,
+        db: AsyncSession,
+        limit: int,
+        query_embedding: Optional[List[float]] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any], bool]:
+        """
+        Hybrid search behind the exact-match cache.
+        The query is embedded once: the vector probes the semantic cache and,
+        on a miss, feeds the semantic search directly.
         OPTIMIZED: Runs semantic and keyword search in parallel.
+
+        Returns:
+            (products, metadata, complete); complete is False when a search leg
+            (or the query embedding) failed, so the result must not be cached
         """
-        import asyncio
-        detected_language = detect_language(query)
+        semantic_enabled = self.settings.enable_semantic_search
+        if not semantic_enabled:
+            query_embedding = None
+        elif query_embedding is None:
+            try:
+                query_embedding = await self.embedding_service.embed_text(query)
+            except Exception as e:
+                logger.error(f"Query embedding failed: {e}")
+
+        analysis = analyze_query(query)
+        detected_language = analysis.language
+        # Paraphrases only share results when they ask for the same product types,
+        # colors and size: "red shirt L" and "blue shirt L" embed almost identically
+        semantic_tag = (limit, analysis.product_keywords, analysis.color_keywords, analysis.size)
+
+        if query_embedding is not None:
+            cached = self._semantic_cache.lookup(query_embedding, tag=semantic_tag)
+            if cached is not None:
+                logger.info("Hybrid search served from semantic cache")
+                products, metadata = cached
+                # The cached metadata describes the query that filled the entry
+                return products, dict(metadata, detected_language=detected_language), True
 
         # PARALLEL EXECUTION: Run both searches concurrently
         async def empty_search():
             return []
 
+        # The vector leg is capped so a slow Qdrant can't hold up the response; the
+        # keyword leg is not, as cancelling it mid-query would break the shared session
         semantic_task = (
-            self.search_products_semantic(query, db, limit=limit, min_score=self.settings.rag_similarity_threshold)
-            if self.settings.enable_semantic_search
+            asyncio.wait_for(
+                self._search_products_semantic(
+                    query, limit=limit,
+                    min_score=self.settings.rag_similarity_threshold,
+                    query_embedding=query_embedding
+                ),
+                timeout=self.settings.rag_semantic_timeout_seconds
+            )
+            if query_embedding is not None
             else empty_search()
         )
-        keyword_task = self.search_products_keyword(query, db, limit=limit)
+        keyword_task = self._search_products_keyword(query, db, limit=limit)
 
         results = await asyncio.gather(semantic_task, keyword_task, return_exceptions=True)
 
-        semantic_results = results[0] if not isinstance(results[0], Exception) else []
-        keyword_results = results[1] if not isinstance(results[1], Exception) else []
-
-        # Merge and deduplicate results
-        seen_ids = set()
-        merged_results = []
-
-        # Prioritize semantic results (higher quality)
-        for product in semantic_results:
-            product_id = product["id"]
-            if product_id not in seen_ids:
-                seen_ids.add(product_id)
-                merged_results.append(product)
+        # A timed-out semantic leg is a failed leg: the keyword-only result is
+        # returned but not cached, so one slow Qdrant call can't pin it for the TTL
+        if isinstance(results[0], asyncio.TimeoutError):
+            logger.warning(
+                "Semantic search timed out after %ss, using keyword results only (not cached)",
+                self.settings.rag_semantic_timeout_seconds
+            )
 
-        # Add keyword results that weren't found semantically
-        for product in keyword_results:
-            product_id = product["id"]
-            if product_id not in seen_ids:
-                seen_ids.add(product_id)
-                merged_results.append(product)
+        for leg, outcome in zip(("Semantic", "Keyword"), results):
+            if isinstance(outcome, Exception) and not isinstance(outcome, asyncio.TimeoutError):
+                logger.error(f"{leg} search failed: {outcome}")
 
-        # Sort by similarity score
-        merged_results.sort(key=lambda x: x["similarity_score"], reverse=True)
+        semantic_results = results[0] if not isinstance(results[0], Exception) else []
+        keyword_results = results[1] if not isinstance(results[1], Exception) else []
+        # A semantic leg skipped because the embedding failed counts as failed too
+        complete = (
+            not any(isinstance(outcome, Exception) for outcome in results)
+            and (query_embedding is not None or not semantic_enabled)
+        )
 
-        # Limit results
-        final_results = merged_results[:limit]
+        # Reciprocal Rank Fusion: each leg contributes 1/(k + rank) per product.
+        # Rank-based, so cosine similarities and keyword matches need no common
+        # scale, and products found by both legs rise to the top.
+        # One dict is both the dedup set and the score table: id -> [score, product]
+        fused: Dict[str, List[Any]] = {}
+        for ranked in (semantic_results, keyword_results):
+            for rank, product in enumerate(ranked, 1):
+                entry = fused.get(product["id"])
+                if entry is None:
+                    fused[product["id"]] = [1.0 / (RRF_K + rank), product]
+                else:
+                    entry[0] += 1.0 / (RRF_K + rank)
+
+        # Top results by fused score; ties keep semantic-first order
+        final_results = [
+            product for _, product in heapq.nlargest(limit, fused.values(), key=itemgetter(0))
+        ]
 
         # Build metadata
         metadata = {
@@ -230,17 +321,22 @@ class RAGService:
         }
 
         logger.info(
-            f"Hybrid search: {len(semantic_results)} semantic + "
-            f"{len(keyword_results)} keyword = {len(final_results)} final"
+            "Hybrid search: %d semantic + %d keyword = %d final",
+            len(semantic_results), len(keyword_results), len(final_results)
         )
 
-        return final_results, metadata
+        # Only full results are reused for paraphrases
+        if complete and final_results and query_embedding is not None:
+            self._semantic_cache.add(query_embedding, (final_results, metadata), tag=semantic_tag)
+
+        return final_results, metadata, complete
 
     async def search_knowledge_base(
         self,
         query: str,
         limit: int = 3,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search knowledge base for relevant information.
@@ -249,6 +345,7 @@ class RAGService:
             query: User query
             limit: Maximum number of results
             category: Optional category filter
+            query_embedding: Precomputed embedding of query (skips re-embedding)
 
         Returns:
             List of relevant knowledge base entries
@@ -259,7 +356,8 @@ class RAGService:
                 return []
 
             # Generate query embedding
-            query_embedding = await self.embedding_service.embed_text(query)
+            if query_embedding is None:
+                query_embedding = await self.embedding_service.embed_text(query)
 
             # Build filter if category provided
             filter_conditions = {}
@@ -287,7 +385,7 @@ class RAGService:
                     "similarity_score": result["score"]
                 })
 
-            logger.info(f"Knowledge base search found {len(knowledge_items)} items")
+            logger.info("Knowledge base search found %d items", len(knowledge_items))
             return knowledge_items
 
         except Exception as e:
@@ -362,15 +460,27 @@ class RAGService:
         Returns:
             Complete context dict with products and knowledge
         """
+        search_knowledge = include_knowledge and self.settings.enable_knowledge_base
+
+        # Embed once up front when both searches need the vector
+        query_embedding = None
+        if search_knowledge:
+            try:
+                query_embedding = await self.embedding_service.embed_text(query)
+            except Exception as e:
+                logger.error(f"Query embedding failed: {e}")
+
         # Search products using hybrid approach
         products, product_metadata = await self.search_products_hybrid(
-            query, db, limit=self.settings.rag_top_k
+            query, db, limit=self.settings.rag_top_k, query_embedding=query_embedding
         )
 
         # Search knowledge base
         knowledge_items = []
-        if include_knowledge and self.settings.enable_knowledge_base:
-            knowledge_items = await self.search_knowledge_base(query, limit=3)
+        if search_knowledge:
+            knowledge_items = await self.search_knowledge_base(
+                query, limit=3, query_embedding=query_embedding
+            )
 
         # Format for AI
         products_formatted = self.format_products_for_ai(products)
@@ -386,6 +496,37 @@ class RAGService:
         }
 
 
+def _product_from_hit(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a product dict from a vector search hit on the products collection."""
+    payload = result["payload"]
+    return {
+        "id": payload.get("product_id"),
+        "name": payload.get("name"),
+        "price": payload.get("price"),
+        "description": payload.get("description"),
+        "sizes": payload.get("sizes", []),
+        "colors": payload.get("colors", []),
+        "stock_count": payload.get("stock_count"),
+        "similarity_score": result["score"],
+        "search_method": "semantic"
+    }
+
+
+def _clone_search_result(
+    result: Tuple[List[Dict[str, Any]], Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Copy a cached search result so callers can't mutate the cache entry.
+    Product dicts hold scalars plus the sizes/colors lists, so those lists are
+    copied too; metadata values are all scalars.
+    """
+    products, metadata = result
+    return [
+        {key: list(value) if isinstance(value, list) else value for key, value in p.items()}
+        for p in products
+    ], dict(metadata)
+
+
 # Global singleton instance
 _rag_service: Optional[RAGService] = None
 
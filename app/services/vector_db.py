@@ -3,18 +3,38 @@ Vector database service using Qdrant.
 Manages collections, indexing, and similarity search.
 """
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import (
     Distance, VectorParams, PointStruct,
-    Filter, FieldCondition, MatchValue,
-    ScoredPoint, PointIdsList
+    Filter, FieldCondition, MatchValue, MatchAny,
+    ScoredPoint, PointIdsList,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    SearchParams, QuantizationSearchParams
 )
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# int8 scalar quantization: the ANN index scans 1-byte components (4x less
+# memory traffic than float32), kept in RAM; originals stay on disk for rescoring
+_QUANTIZATION_CONFIG = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+)
+
+# Candidates come from the quantized index (oversampled), then are rescored
+# with the full-precision vectors so ranking and score thresholds are unchanged.
+# Ignored by Qdrant for collections without quantization.
+_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(
+        ignore=False,
+        rescore=True,
+        oversampling=settings.qdrant_quantization_oversampling
+    )
+)
+
 
 class VectorDatabase:
     """
@@ -24,17 +44,20 @@ class VectorDatabase:
 
     def __init__(self):
         self.settings = settings
-        self.client: Optional[QdrantClient] = None
+        self.client: Optional[AsyncQdrantClient] = None
         self._connect()
 
     def _connect(self):
-        """Connect to Qdrant instance."""
+        """Create the Qdrant client (connections are opened lazily on first request)."""
         try:
             logger.info(f"Connecting to Qdrant at {self.settings.qdrant_url}")
-            self.client = QdrantClient(
+            # Async client: searches are awaited instead of blocking the event loop.
+            # gRPC keeps one HTTP/2 channel open and sends vectors as packed floats.
+            self.client = AsyncQdrantClient(
                 url=self.settings.qdrant_url,
                 api_key=self.settings.qdrant_api_key,
-                timeout=10.0
+                prefer_grpc=self.settings.qdrant_prefer_grpc,
+                timeout=10
             )
             logger.info("Successfully connected to Qdrant")
         except Exception as e:
@@ -43,11 +66,19 @@ class VectorDatabase:
             self.client = None
 
     def is_connected(self) -> bool:
-        """Check if connected to Qdrant."""
+        """
+        Check if a Qdrant client is available.
+        Cheap enough for every search; a request against an unreachable server
+        fails on its own and is handled by the caller. Use ping() for health checks.
+        """
+        return self.client is not None
+
+    async def ping(self) -> bool:
+        """Check that Qdrant is reachable with a round-trip."""
         if not self.client:
             return False
         try:
-            self.client.get_collections()
+            await self.client.get_collections()
             return True
         except Exception:
             return False
@@ -71,23 +102,24 @@ class VectorDatabase:
         for collection_name, description in collections:
             try:
                 # Check if collection exists
-                collections_list = self.client.get_collections().collections
+                collections_list = (await self.client.get_collections()).collections
                 exists = any(c.name == collection_name for c in collections_list)
 
                 if not exists:
                     logger.info(f"Creating collection: {collection_name}")
-                    self.client.create_collection(
+                    await self.client.create_collection(
                         collection_name=collection_name,
                         vectors_config=VectorParams(
                             size=embedding_dimension,
                             distance=Distance.COSINE
-                        )
+                        ),
+                        quantization_config=self._quantization_config()
                     )
                     logger.info(f"Created collection: {collection_name}")
                 else:
                     # Validate existing collection has matching dimension
                     try:
-                        collection_info = self.client.get_collection(collection_name)
+                        collection_info = await self.client.get_collection(collection_name)
                         existing_dim = collection_info.config.params.vectors.size
                         if existing_dim != embedding_dimension:
                             logger.warning(
@@ -96,6 +128,14 @@ class VectorDatabase:
                             )
                         else:
                             logger.info(f"Collection already exists: {collection_name} (dimension: {existing_dim})")
+
+                        # Collections created before quantization was enabled get it added in place
+                        if self._quantization_config() and not collection_info.config.quantization_config:
+                            await self.client.update_collection(
+                                collection_name=collection_name,
+                                quantization_config=self._quantization_config()
+                            )
+                            logger.info(f"Enabled int8 quantization on {collection_name}")
                     except Exception as e:
                         logger.warning(f"Could not validate collection dimension: {e}")
             except Exception as e:
@@ -146,7 +186,7 @@ class VectorDatabase:
                 logger.warning("No valid points to upsert after validation")
                 return False
 
-            self.client.upsert(
+            await self.client.upsert(
                 collection_name=collection_name,
                 points=point_structs
             )
@@ -175,53 +215,65 @@ class VectorDatabase:
             filter_conditions: Optional filters on payload fields
 
         Returns:
-            List of search results with id, score, and payload
+            List of search results with id, score, and payload (raises if the query fails)
         """
         if not self.client:
             logger.error("Qdrant client not connected")
             return []
 
         try:
-            # Build filter if conditions provided
-            query_filter = None
-            if filter_conditions:
-                conditions = []
-                for field, value in filter_conditions.items():
-                    conditions.append(
-                        FieldCondition(
-                            key=field,
-                            match=MatchValue(value=value)
-                        )
-                    )
-                if conditions:
-                    query_filter = Filter(must=conditions)
+            query_filter = self._build_filter(filter_conditions)
 
             # Perform search using query_points (replaces deprecated search method)
             # Note: query_points returns a response object with .points attribute
-            search_response = self.client.query_points(
+            search_response = await self.client.query_points(
                 collection_name=collection_name,
                 query=query_vector,
                 limit=limit,
                 score_threshold=score_threshold,
-                query_filter=query_filter
+                query_filter=query_filter,
+                search_params=_SEARCH_PARAMS
             )
 
-            # Format results with null checks
             # query_points returns a response object, access .points to get the list
-            results = []
-            for hit in search_response.points:
-                results.append({
-                    "id": str(hit.id),
-                    "score": hit.score if hit.score is not None else 0.0,
-                    "payload": hit.payload if hit.payload is not None else {}
-                })
-
-            logger.info(f"Found {len(results)} results in {collection_name}")
+            results = self._format_hits(search_response.points)
+
+            logger.info("Found %d results in %s", len(results), collection_name)
             return results
 
         except Exception as e:
+            # Re-raised so callers can tell a failed search from one with no hits
             logger.error(f"Search failed: {e}")
-            return []
+            raise
+
+    def _quantization_config(self) -> Optional[ScalarQuantization]:
+        """Quantization config for new collections, or None if disabled."""
+        return _QUANTIZATION_CONFIG if self.settings.qdrant_int8_quantization else None
+
+    @staticmethod
+    def _build_filter(filter_conditions: Optional[Dict[str, Any]]) -> Optional[Filter]:
+        """
+        Build a payload filter, or None if there are no conditions.
+        Scalar values must match exactly; list values match any of their items.
+        """
+        if not filter_conditions:
+            return None
+        return _cached_filter(tuple(
+            (field, tuple(value) if isinstance(value, (list, tuple, set, frozenset)) else value)
+            for field, value in filter_conditions.items()
+        ))
+
+    @staticmethod
+    def _format_hits(points: List[ScoredPoint]) -> List[Dict[str, Any]]:
+        """Convert scored points to result dicts (with null checks)."""
+        return [
+            {
+                "id": str(hit.id),
+                "score": hit.score if hit.score is not None else 0.0,
+                "payload": hit.payload if hit.payload is not None else {}
+            }
+            for hit in points
+        ]
 
     async def delete_points(
         self,
@@ -247,7 +299,7 @@ class VectorDatabase:
             return True
 
         try:
-            self.client.delete(
+            await self.client.delete(
                 collection_name=collection_name,
                 points_selector=PointIdsList(points=point_ids)
             )
@@ -271,7 +323,7 @@ class VectorDatabase:
             return None
 
         try:
-            info = self.client.get_collection(collection_name)
+            info = await self.client.get_collection(collection_name)
             return {
                 "name": collection_name,
                 "vectors_count": info.vectors_count,
@@ -296,18 +348,31 @@ class VectorDatabase:
             return 0
 
         try:
-            info = self.client.get_collection(collection_name)
+            info = await self.client.get_collection(collection_name)
             return info.points_count or 0
         except Exception:
             return 0
 
-    def close(self):
+    async def close(self):
         """Close connection to Qdrant."""
         if self.client:
-            self.client.close()
+            await self.client.close()
             logger.info("Qdrant connection closed")
 
 
+@lru_cache(maxsize=256)
+def _cached_filter(conditions: Tuple[Tuple[str, Any], ...]) -> Filter:
+    """Filter for frozen (field, value) pairs; repeated filters reuse one object."""
+    return Filter(must=[
+        FieldCondition(
+            key=field,
+            # One condition (one index probe) for "any of", instead of one per value
+            match=MatchAny(any=list(value)) if isinstance(value, tuple) else MatchValue(value=value)
+        )
+        for field, value in conditions
+    ])
+
+
 # Global singleton instance
 _vector_db: Optional[VectorDatabase] = None
 
@@ -330,5 +395,5 @@ async def close_vector_db():
     """Close vector database connection."""
     global _vector_db
     if _vector_db:
-        _vector_db.close()
+        await _vector_db.close()
         _vector_db = None
@@ -0,0 +1,87 @@
+"""
+Multi-keyword substring matcher.
+Scans text once for every variant of every keyword group using an Aho-Corasick
+automaton (pyahocorasick). Falls back to a plain substring loop if the package
+is not installed.
+"""
+
+import logging
+from typing import Dict, Hashable, Iterable, Iterator, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import ahocorasick
+except ImportError:  # optional dependency
+    ahocorasick = None
+    logger.warning("pyahocorasick not available, keyword matching uses substring scan")
+
+
+class KeywordMatcher:
+    """
+    Match (kind, canonical) keyword groups against text in a single pass.
+
+    Built from {kind: {canonical: [variants...]}}. Variants are lowercased and
+    matched as substrings, so callers should lowercase the text they pass in.
+    With ascii_word_start, ASCII variants only match at the start of a word
+    ("hat" does not match inside "what"); suffixes such as plurals still match.
+    Non-ASCII variants stay plain substrings so attached Arabic prefixes
+    (e.g. the article "ال") do not hide a match.
+    """
+
+    def __init__(
+        self,
+        groups: Dict[Hashable, Dict[str, Iterable[str]]],
+        ascii_word_start: bool = False
+    ):
+        # variant -> every (kind, canonical) it belongs to
+        self._variants: Dict[str, List[Tuple[Hashable, str]]] = {}
+        for kind, keywords in groups.items():
+            for canonical, variants in keywords.items():
+                for variant in variants:
+                    targets = self._variants.setdefault(variant.lower(), [])
+                    if (kind, canonical) not in targets:
+                        targets.append((kind, canonical))
+
+        # Variants that must start a word
+        self._word_start: Set[str] = {
+            variant for variant in self._variants if ascii_word_start and variant.isascii()
+        }
+
+        self._automaton = None
+        if ahocorasick is not None and self._variants:
+            automaton = ahocorasick.Automaton()
+            for variant, targets in self._variants.items():
+                automaton.add_word(
+                    variant, (len(variant), variant in self._word_start, tuple(targets))
+                )
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Hashable, str]]:
+        """Yield (start, end, kind, canonical) for every variant occurrence in text."""
+        if self._automaton is not None:
+            # pyahocorasick reports the index of the last matched character
+            for last, (length, word_start, targets) in self._automaton.iter(text):
+                start = last - length + 1
+                if word_start and start and text[start - 1].isalnum():
+                    continue
+                for kind, canonical in targets:
+                    yield start, last + 1, kind, canonical
+            return
+
+        for variant, targets in self._variants.items():
+            word_start = variant in self._word_start
+            start = text.find(variant)
+            while start != -1:
+                if not (word_start and start and text[start - 1].isalnum()):
+                    for kind, canonical in targets:
+                        yield start, start + len(variant), kind, canonical
+                start = text.find(variant, start + 1)
+
+    def match(self, text: str) -> Dict[Hashable, Set[str]]:
+        """Return {kind: {canonical, ...}} for all keyword groups found in text."""
+        found: Dict[Hashable, Set[str]] = {}
+        for _, _, kind, canonical in self.iter_matches(text):
+            found.setdefault(kind, set()).add(canonical)
+        return found
@@ -0,0 +1,85 @@
+"""
+In-process semantic cache.
+Maps query embeddings to results and answers lookups for any stored vector
+whose cosine similarity with the probe is above a threshold.
+"""
+
+import time
+from typing import Any, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Fixed-size ring buffer of unit-normalized embeddings.
+    A lookup is one matrix-vector product over the live entries.
+    Entries carry a tag (e.g. the result limit) and only match probes with the same tag.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0, threshold: float = 0.95):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._vectors: Optional[np.ndarray] = None
+        self._expires = np.zeros(maxsize, dtype=np.float64)
+        self._tags: List[Optional[Hashable]] = [None] * maxsize
+        self._values: List[Any] = [None] * maxsize
+        self._count = 0
+        self._next = 0
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> Optional[np.ndarray]:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return None
+        return vec / norm
+
+    def lookup(self, vector: Sequence[float], tag: Hashable = None) -> Optional[Any]:
+        """Return the value of the most similar live entry with this tag, if above threshold."""
+        if self._count == 0:
+            return None
+        vec = self._normalize(vector)
+        if vec is None or vec.shape[0] != self._vectors.shape[1]:
+            return None
+
+        sims = self._vectors[:self._count] @ vec
+        sims[self._expires[:self._count] < time.monotonic()] = -1.0
+        for i in np.argsort(sims)[::-1]:
+            if sims[i] < self.threshold:
+                break
+            if self._tags[i] == tag:
+                return self._values[i]
+        return None
+
+    def add(self, vector: Sequence[float], value: Any, tag: Hashable = None) -> None:
+        """Store a value, overwriting the oldest entry when full."""
+        if self.maxsize <= 0:
+            return
+        vec = self._normalize(vector)
+        if vec is None:
+            return
+        if self._vectors is None or self._vectors.shape[1] != vec.shape[0]:
+            # First entry (or embedding model changed): size the matrix to this dimension
+            self._vectors = np.zeros((self.maxsize, vec.shape[0]), dtype=np.float32)
+            self._count = 0
+            self._next = 0
+
+        i = self._next
+        self._vectors[i] = vec
+        self._expires[i] = time.monotonic() + self.ttl
+        self._tags[i] = tag
+        self._values[i] = value
+        self._next = (i + 1) % self.maxsize
+        self._count = min(self._count + 1, self.maxsize)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._count = 0
+        self._next = 0
+        self._tags = [None] * self.maxsize
+        self._values = [None] * self.maxsize
+
+    def __len__(self) -> int:
+        return self._count
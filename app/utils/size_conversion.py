@@ -93,8 +93,8 @@ def normalize_size(size: str) -> List[str]:
         # Clothing sizes are usually universal, just normalize format
         pass
 
-    # Remove duplicates and return
-    return list(set(equivalent_sizes))
+    # Remove duplicates (keeping the requested size first) and return
+    return list(dict.fromkeys(equivalent_sizes))
 
 
 def get_equivalent_sizes(size: str) -> str:
@@ -0,0 +1,45 @@
+"""
+Bounded in-process TTL cache.
+Small LRU keyed by any hashable value; entries expire after a fixed TTL.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """LRU cache with per-entry expiry (not thread-safe; meant for the event loop)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,14 @@
+-- Migration: Store response_cache.message_hash as a raw 16-byte digest
+-- The key switches from a hex MD5 string to the raw xxh3_128 digest (BYTEA),
+-- halving key size in the unique index. Existing entries were hashed with MD5
+-- and would never match again, so the cache is emptied rather than converted.
+
+TRUNCATE TABLE response_cache;
+
+ALTER TABLE response_cache
+    ALTER COLUMN message_hash TYPE BYTEA USING decode(message_hash, 'hex');
+
+ALTER TABLE response_cache
+    ADD CONSTRAINT response_cache_message_hash_len CHECK (octet_length(message_hash) = 16);
+
+COMMENT ON COLUMN response_cache.message_hash IS 'Raw xxh3_128 digest of the normalized message';
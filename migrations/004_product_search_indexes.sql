@@ -0,0 +1,22 @@
+-- Migration: Indexes for product keyword search
+-- Keyword search is `name/description ILIKE ANY('%kw%', ...) OR colors && ARRAY[...]`
+-- over active products, ordered by stock_count DESC with a small LIMIT.
+-- Without these, every search is a sequential scan plus a sort of all matches.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Trigram GIN indexes let the planner serve leading-wildcard ILIKE from an index
+CREATE INDEX IF NOT EXISTS idx_products_name_trgm
+    ON products USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_products_description_trgm
+    ON products USING GIN (description gin_trgm_ops);
+
+-- Array overlap (colors && ARRAY[...])
+CREATE INDEX IF NOT EXISTS idx_products_colors
+    ON products USING GIN (colors);
+
+-- Partial index matching the hot filter + sort: active products by stock, so
+-- "top products" and small-LIMIT searches read rows in order and stop early
+CREATE INDEX IF NOT EXISTS idx_products_active_stock
+    ON products (stock_count DESC)
+    WHERE is_active = TRUE;
@@ -0,0 +1,8 @@
+-- Migration: One index on response_cache.message_hash
+-- The UNIQUE constraint on message_hash already creates a unique B-tree index
+-- (response_cache_message_hash_key from schema.sql, or ix_response_cache_message_hash
+-- when the table was created by SQLAlchemy), which serves check_cache lookups and
+-- is the arbiter for store_cache's INSERT ... ON CONFLICT (message_hash).
+-- idx_cache_hash duplicated it, so every cache write maintained two identical indexes.
+
+DROP INDEX IF EXISTS idx_cache_hash;
@@ -0,0 +1,17 @@
+-- Migration: Store conversations.channel as a native enum
+-- The column was already restricted to instagram/whatsapp by a CHECK constraint
+-- (and every request schema validates the same two values), so a closed enum
+-- rejects nothing new; like msg_direction it is 4 bytes instead of a VARCHAR.
+
+DO $$ BEGIN
+    CREATE TYPE msg_channel AS ENUM ('instagram', 'whatsapp');
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END $$;
+
+ALTER TABLE conversations DROP CONSTRAINT IF EXISTS conversations_channel_check;
+
+ALTER TABLE conversations
+    ALTER COLUMN channel TYPE msg_channel USING channel::msg_channel;
+
+COMMENT ON COLUMN conversations.channel IS 'Message channel: instagram or whatsapp';
@@ -44,13 +44,26 @@ CREATE EXTENSION IF NOT EXISTS "pgcrypto";
 -- NEW TABLES FOR MICROSERVICE
 -- ============================================================================
 
+-- Message direction and channel enums
+DO $$ BEGIN
+    CREATE TYPE msg_direction AS ENUM ('incoming', 'outgoing');
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TYPE msg_channel AS ENUM ('instagram', 'whatsapp');
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END $$;
+
 -- Conversations table - stores all messages
 CREATE TABLE IF NOT EXISTS conversations (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     customer_id VARCHAR(255) NOT NULL,
-    channel VARCHAR(50) NOT NULL CHECK (channel IN ('instagram', 'whatsapp')),
+    channel msg_channel NOT NULL,
     message TEXT NOT NULL,
-    direction VARCHAR(20) NOT NULL CHECK (direction IN ('incoming', 'outgoing')),
+    direction msg_direction NOT NULL,
     intent VARCHAR(100),
     metadata JSONB DEFAULT '{}',
     created_at TIMESTAMP DEFAULT NOW()
@@ -79,7 +92,7 @@ CREATE INDEX IF NOT EXISTS idx_customers_linked ON customers USING GIN (linked_i
 -- Response cache table
 CREATE TABLE IF NOT EXISTS response_cache (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    message_hash VARCHAR(64) UNIQUE NOT NULL,
+    message_hash BYTEA UNIQUE NOT NULL, -- raw 16-byte xxh3_128 digest
     normalized_message TEXT NOT NULL,
     cached_response TEXT NOT NULL,
     intent VARCHAR(100),
@@ -88,8 +101,7 @@ CREATE TABLE IF NOT EXISTS response_cache (
     expires_at TIMESTAMP NOT NULL
 );
 
--- Indexes for response cache
-CREATE INDEX IF NOT EXISTS idx_cache_hash ON response_cache(message_hash);
+-- Indexes for response cache (message_hash lookups use the UNIQUE constraint's index)
 CREATE INDEX IF NOT EXISTS idx_cache_expires ON response_cache(expires_at);
 CREATE INDEX IF NOT EXISTS idx_cache_intent ON response_cache(intent);
 
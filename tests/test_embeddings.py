@@ -0,0 +1,105 @@
+"""Unit tests for the embedding service cache and batcher (app.services.embeddings)."""
+import asyncio
+
+from app.services.embeddings import EmbeddingBatcher, EmbeddingService
+from app.utils.ttl_cache import TTLCache
+
+
+def _service(embed):
+    """EmbeddingService with its model call replaced by embed (no model or API client)."""
+    service = object.__new__(EmbeddingService)
+    service._cache = TTLCache(maxsize=16, ttl=60.0)
+    service._inflight = {}
+    service._embed_uncached = embed
+    return service
+
+
+def test_embed_text_returns_same_values_on_miss_and_hit():
+    async def embed(text):
+        return [0.1, 0.2, 1 / 3]  # not exactly representable in float32
+
+    async def run():
+        service = _service(embed)
+        return await service.embed_text("hoodie"), await service.embed_text("hoodie")
+
+    miss, hit = asyncio.run(run())
+    assert miss == hit
+
+
+def test_embed_text_shares_one_call_between_concurrent_callers():
+    calls = []
+
+    async def embed(text):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return [0.1, 0.2, 1 / 3]
+
+    async def run():
+        service = _service(embed)
+        return await asyncio.gather(service.embed_text("hoodie"), service.embed_text("hoodie"))
+
+    first, second = asyncio.run(run())
+    assert calls == ["hoodie"]
+    assert first == second
+
+
+def _recording_batch(calls):
+    async def embed_batch(texts):
+        calls.append(list(texts))
+        await asyncio.sleep(0)
+        return [[float(len(text))] for text in texts]
+    return embed_batch
+
+
+def test_batcher_coalesces_calls_within_the_window():
+    calls = []
+
+    async def run():
+        batcher = EmbeddingBatcher(_recording_batch(calls), max_batch=16, max_wait_ms=20)
+        return await asyncio.gather(
+            batcher.embed("a"), batcher.embed("bb"), batcher.embed("a"), batcher.embed("ccc")
+        )
+
+    results = asyncio.run(run())
+    assert calls == [["a", "bb", "ccc"]]  # one call, duplicates embedded once
+    assert results == [[1.0], [2.0], [1.0], [3.0]]
+
+
+def test_batcher_flushes_when_max_batch_is_reached():
+    calls = []
+
+    async def run():
+        # A window far longer than the test: only max_batch can trigger the first flush
+        batcher = EmbeddingBatcher(_recording_batch(calls), max_batch=2, max_wait_ms=60_000)
+        return await asyncio.gather(batcher.embed("a"), batcher.embed("bb"))
+
+    assert asyncio.run(run()) == [[1.0], [2.0]]
+    assert calls == [["a", "bb"]]
+
+
+def test_batcher_sends_later_calls_in_a_new_batch():
+    calls = []
+
+    async def run():
+        batcher = EmbeddingBatcher(_recording_batch(calls), max_batch=16, max_wait_ms=1)
+        first = await batcher.embed("a")
+        second = await batcher.embed("bb")
+        return first, second
+
+    assert asyncio.run(run()) == ([1.0], [2.0])
+    assert calls == [["a"], ["bb"]]
+
+
+def test_batcher_error_reaches_every_waiter():
+    async def embed_batch(texts):
+        raise RuntimeError("model unavailable")
+
+    async def run():
+        batcher = EmbeddingBatcher(embed_batch, max_batch=16, max_wait_ms=1)
+        return await asyncio.gather(
+            batcher.embed("a"), batcher.embed("bb"), batcher.embed("a"), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) for result in results)
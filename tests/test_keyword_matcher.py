@@ -0,0 +1,95 @@
+"""Unit tests for the single-pass keyword matcher (app.utils.keyword_matcher)."""
+import copy
+import random
+
+import pytest
+
+from app.services import products
+from app.services.products import COLOR_KEYWORDS, PRODUCT_KEYWORDS, extract_product_keywords
+from app.utils import keyword_matcher
+from app.utils.keyword_matcher import KeywordMatcher
+
+GROUPS = {"product": PRODUCT_KEYWORDS, "color": COLOR_KEYWORDS}
+
+QUERIES = [
+    "red shirt", "shirts", "t-shirt in blue", "what do you have", "ordered a hoodie",
+    "sweatshirt", "redshirt", "black jeans size 32", "القميص الاحمر", "عايز هودي اسود",
+    "3ayez t-shirt a7mar", "white sneakers and a hat", "chat about that", "bored",
+]
+
+
+def _random_texts(count=300, seed=1234):
+    """Texts built from keyword variants glued to random letters, digits and Arabic."""
+    rng = random.Random(seed)
+    variants = [v.lower() for kw in GROUPS.values() for vs in kw.values() for v in vs]
+    filler = list("abcdefghijklmnopqrstuvwxyz0123456789 -.,") + ["ال", "و", "ب"]
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 6)):
+            parts.append("".join(rng.choice(filler) for _ in range(rng.randint(0, 3))))
+            parts.append(rng.choice(variants))
+        texts.append("".join(parts))
+    return texts
+
+
+def _fallback(matcher):
+    """Copy of matcher that uses the pure-Python substring scan."""
+    fallback = copy.copy(matcher)
+    fallback._automaton = None
+    return fallback
+
+
+def test_word_start_skips_matches_inside_words():
+    matcher = KeywordMatcher({"product": {"hat": ["hat"]}, "color": {"red": ["red"]}}, ascii_word_start=True)
+
+    assert matcher.match("what") == {}
+    assert matcher.match("ordered") == {}
+    assert matcher.match("hats") == {"product": {"hat"}}  # suffixes still match
+    assert matcher.match("red-hat") == {"product": {"hat"}, "color": {"red"}}
+
+
+def test_non_ascii_variants_match_after_arabic_prefixes():
+    matcher = KeywordMatcher({"color": {"red": ["احمر"]}}, ascii_word_start=True)
+
+    assert matcher.match("الاحمر") == {"color": {"red"}}
+    assert matcher.match("واحمر") == {"color": {"red"}}
+
+
+@pytest.mark.skipif(keyword_matcher.ahocorasick is None, reason="pyahocorasick not installed")
+@pytest.mark.parametrize("ascii_word_start", [False, True])
+def test_fallback_scan_matches_automaton(ascii_word_start):
+    matcher = KeywordMatcher(GROUPS, ascii_word_start=ascii_word_start)
+    fallback = _fallback(matcher)
+    assert matcher._automaton is not None
+
+    for text in QUERIES + _random_texts():
+        text = text.lower()
+        assert sorted(matcher.iter_matches(text)) == sorted(fallback.iter_matches(text)), text
+        assert matcher.match(text) == fallback.match(text), text
+
+
+def test_product_keywords_pin_word_start_behaviour():
+    # Plain substring matching (the previous behaviour) found these inside other words
+    substring = KeywordMatcher(GROUPS)
+    assert "red" in substring.match("ordered")["color"]
+    assert "shirt" in substring.match("sweatshirt")["product"]
+
+    assert extract_product_keywords("ordered") == (frozenset(), frozenset())
+    assert extract_product_keywords("what") == (frozenset(), frozenset())
+    assert extract_product_keywords("sweatshirt") == (frozenset({"hoodie"}), frozenset())
+    assert extract_product_keywords("red shirt") == (frozenset({"shirt"}), frozenset({"red"}))
+    assert extract_product_keywords("shirts") == (frozenset({"shirt"}), frozenset())
+    assert extract_product_keywords("القميص الاحمر") == (frozenset({"shirt"}), frozenset({"red"}))
+
+
+def test_word_start_only_drops_substring_matches():
+    """Compared to plain substring matching, word-start matching never adds a match."""
+    substring = KeywordMatcher(GROUPS)
+
+    for text in QUERIES + _random_texts():
+        text = text.lower()
+        word_start = products._KEYWORD_MATCHER.match(text)
+        plain = substring.match(text)
+        for kind, canonicals in word_start.items():
+            assert canonicals <= plain.get(kind, set()), text
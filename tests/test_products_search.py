@@ -0,0 +1,26 @@
+"""Unit tests for keyword product search (app.services.products)."""
+import asyncio
+import logging
+
+from app.services.products import search_products
+
+
+class _EmptyResult:
+    def all(self):
+        return []
+
+
+class _FakeSession:
+    async def execute(self, stmt, params=None):
+        return _EmptyResult()
+
+
+def test_search_metadata_lists_keywords_with_info_logging_disabled():
+    logging.disable(logging.INFO)
+    try:
+        response = asyncio.run(search_products(_FakeSession(), "red hoodie size L"))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert sorted(response.search_metadata.matched_keywords) == ["L", "hoodie", "red"]
+    assert response.search_metadata.total_found == 0
@@ -0,0 +1,52 @@
+"""Unit tests for the hybrid product search caches (app.services.rag)."""
+import asyncio
+
+from app.services import rag
+from app.utils.semantic_cache import SemanticCache
+from app.utils.ttl_cache import TTLCache
+
+
+class _Embeddings:
+    async def embed_text(self, text):
+        return [1.0, 0.0, 0.0]
+
+
+def _service():
+    """RAGService with stubbed search legs (no Qdrant, database or model)."""
+    service = object.__new__(rag.RAGService)
+    service.settings = rag.settings
+    service.embedding_service = _Embeddings()
+    service._search_cache = TTLCache(maxsize=16, ttl=60.0)
+    service._semantic_cache = SemanticCache(maxsize=16, ttl=60.0, threshold=0.95)
+    service._inflight_searches = {}
+    service.semantic_calls = 0
+
+    async def semantic(query, limit, min_score, query_embedding=None):
+        service.semantic_calls += 1
+        return [{"id": "1", "name": "Hoodie", "sizes": ["M", "L"], "colors": ["red"],
+                 "similarity_score": 0.9, "search_method": "semantic"}]
+
+    async def keyword(query, db, limit):
+        return []
+
+    service._search_products_semantic = semantic
+    service._search_products_keyword = keyword
+    return service
+
+
+def test_editing_a_returned_result_leaves_the_cached_entry_unchanged():
+    async def run():
+        service = _service()
+        products, metadata = await service.search_products_hybrid("red hoodie", db=None)
+        products[0]["sizes"].append("XXL")
+        products[0]["colors"].clear()
+        products[0]["name"] = "changed"
+        metadata["total_found"] = 99
+        return service, await service.search_products_hybrid("red hoodie", db=None)
+
+    service, (products, metadata) = asyncio.run(run())
+    assert service.semantic_calls == 1  # second search was a cache hit
+    assert products[0]["sizes"] == ["M", "L"]
+    assert products[0]["colors"] == ["red"]
+    assert products[0]["name"] == "Hoodie"
+    assert metadata["total_found"] == 1
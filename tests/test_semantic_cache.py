@@ -0,0 +1,79 @@
+"""Unit tests for the embedding-keyed semantic cache (app.utils.semantic_cache)."""
+from app.utils import semantic_cache
+from app.utils.semantic_cache import SemanticCache
+
+
+def test_lookup_hits_only_above_threshold():
+    cache = SemanticCache(maxsize=4, ttl=60.0, threshold=0.95)
+    cache.add([1.0, 0.0], "stored")
+
+    assert cache.lookup([2.0, 0.0]) == "stored"  # same direction, different norm
+    assert cache.lookup([1.0, 0.2]) == "stored"  # cosine ~0.98
+    assert cache.lookup([1.0, 0.5]) is None      # cosine ~0.89
+    assert cache.lookup([0.0, 1.0]) is None
+
+
+def test_lookup_only_matches_entries_with_the_same_tag():
+    cache = SemanticCache(maxsize=4, ttl=60.0, threshold=0.95)
+    cache.add([1.0, 0.0], "five", tag=5)
+    cache.add([1.0, 0.01], "ten", tag=10)
+
+    assert cache.lookup([1.0, 0.0], tag=5) == "five"
+    assert cache.lookup([1.0, 0.0], tag=10) == "ten"
+    assert cache.lookup([1.0, 0.0], tag=3) is None
+
+
+def test_lookup_returns_the_most_similar_entry():
+    cache = SemanticCache(maxsize=4, ttl=60.0, threshold=0.9)
+    cache.add([1.0, 0.3], "further")
+    cache.add([1.0, 0.05], "closer")
+
+    assert cache.lookup([1.0, 0.0]) == "closer"
+
+
+def test_ring_buffer_overwrites_the_oldest_entry():
+    cache = SemanticCache(maxsize=2, ttl=60.0, threshold=0.99)
+    cache.add([1.0, 0.0, 0.0], "a")
+    cache.add([0.0, 1.0, 0.0], "b")
+    cache.add([0.0, 0.0, 1.0], "c")  # wraps around onto "a"
+
+    assert len(cache) == 2
+    assert cache.lookup([1.0, 0.0, 0.0]) is None
+    assert cache.lookup([0.0, 1.0, 0.0]) == "b"
+    assert cache.lookup([0.0, 0.0, 1.0]) == "c"
+
+    cache.add([1.0, 0.0, 0.0], "d")  # next slot is "b"
+    assert cache.lookup([0.0, 1.0, 0.0]) is None
+    assert cache.lookup([0.0, 0.0, 1.0]) == "c"
+    assert cache.lookup([1.0, 0.0, 0.0]) == "d"
+
+
+def test_expired_entries_do_not_match(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "monotonic", lambda: now[0])
+    cache = SemanticCache(maxsize=4, ttl=10.0, threshold=0.95)
+    cache.add([1.0, 0.0], "stored")
+
+    now[0] += 5
+    assert cache.lookup([1.0, 0.0]) == "stored"
+    now[0] += 6
+    assert cache.lookup([1.0, 0.0]) is None
+
+
+def test_zero_vectors_and_dimension_mismatches_miss():
+    cache = SemanticCache(maxsize=4, ttl=60.0, threshold=0.95)
+    cache.add([0.0, 0.0], "ignored")
+    assert len(cache) == 0
+
+    cache.add([1.0, 0.0], "stored")
+    assert cache.lookup([0.0, 0.0]) is None
+    assert cache.lookup([1.0, 0.0, 0.0]) is None
+
+
+def test_new_dimension_resets_the_cache():
+    cache = SemanticCache(maxsize=4, ttl=60.0, threshold=0.95)
+    cache.add([1.0, 0.0], "2d")
+    cache.add([1.0, 0.0, 0.0], "3d")
+
+    assert len(cache) == 1
+    assert cache.lookup([1.0, 0.0, 0.0]) == "3d"
@@ -0,0 +1,66 @@
+"""Unit tests for the in-process TTL cache (app.utils.ttl_cache)."""
+from app.utils import ttl_cache
+from app.utils.ttl_cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock)
+    cache = TTLCache(maxsize=4, ttl=10.0)
+
+    cache.set("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+
+    clock.now += 0.2
+    assert cache.get("a") is None
+    assert len(cache) == 0  # expired entry is dropped on access
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60.0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now the most recently used
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_overwrite_refreshes_expiry(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock)
+    cache = TTLCache(maxsize=4, ttl=10.0)
+
+    cache.set("a", 1)
+    clock.now += 8
+    cache.set("a", 2)
+    clock.now += 8
+    assert cache.get("a") == 2
+
+
+def test_zero_size_cache_stores_nothing():
+    cache = TTLCache(maxsize=0, ttl=60.0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_clear_drops_all_entries():
+    cache = TTLCache(maxsize=4, ttl=60.0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("a") is None